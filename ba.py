@@ -11,18 +11,28 @@ Important class methods are:
 - add_transition(self, from_state, symbol, to_state, accept_new_elements=True)
     - Adds new transition to the automaton. 
     If accept_new_elements = False, then a not-yet-existent state or symbol will cause an error
+- remove_transition(self, from_state, symbol, to_state) / remove_state(self, state)
+    - Removes a transition or a state (with all its transitions) from the automaton
+- successors(self, state, symbol=None) / predecessors(self, state, symbol=None)
+    - Looks up the neighbours of a state in lazily built, incrementally maintained indexes
 - visualize(self, filename)
     - Plots a .png image of the automaton
-- reduce_nondeterm(self)
+- reduce_nondeterm(self, fast_path=True)
     - Performs an algorithm for non-determinism reduction, developed by Ultes-Nitsche
-- upper_part(self)
+- upper_part(self, fast_path=True)
     - Performs the first step of the complementation construction in Allred & Ultes-Nitshce's algorithm
+- classify(self) / reduce_nondeterm_path(self) / upper_part_path(self)
+    - Returns cached structural flags (see Classification), and which algorithm the constructions dispatch to
 - equals(self, other)
     - Checks if two automata are isomorphic, i.e. if there is a bijective mapping between them that preserves the structure. 
+- minimize(self)
+    - Merges bisimilar states, which preserves the language of the automaton
+- copy(self) / freeze(self)
+    - Returns a cheap copy-on-write copy, or an immutable and hashable snapshot (FrozenBuchiAutomaton)
 """
 
 from dataclasses import dataclass, field
-from typing import Set, Dict, Tuple
+from typing import Set, Dict, List, Tuple, Optional, FrozenSet
 from graphviz import Digraph
 import re
 import networkx as nx
@@ -31,6 +41,26 @@ import os
 
 PLOTTED_BAs_FOLDER_NAME = "plots"
 
+# The algorithms that reduce_nondeterm() and upper_part() dispatch to, as reported by reduce_nondeterm_path() and upper_part_path()
+GENERAL_PATH = "general"
+DETERMINISTIC_PATH = "deterministic"
+PROPERTY_PI_PATH = "property PI"
+
+def split_macrostate(macrostate: str) -> List[List[str]]:
+    """Splits the id of a macrostate of an upper part, like "{1,2},{3}", into its sets of states, from left to right."""
+    return [S.split(sep=",") for S in re.findall(r'\{([^}]*)\}', macrostate)] # identifies groups within curly brackets in a string
+
+def _discard_from_index(index: Dict[str, Dict[str, Set[str]]], state: str, symbol: str, neighbour: str) -> None:
+    """Removes one entry from a successor or predecessor index, dropping buckets that become empty."""
+    by_symbol = index.get(state)
+    if by_symbol is None or symbol not in by_symbol:
+        return
+    by_symbol[symbol].discard(neighbour)
+    if not by_symbol[symbol]:
+        del by_symbol[symbol]
+    if not by_symbol:
+        del index[state]
+
 @dataclass
 class BuchiAutomaton:
     """Class representing Büchi Automata objects.
@@ -46,12 +76,18 @@ class BuchiAutomaton:
     - add_transition(self, from_state, symbol, to_state, accept_new_elements=True)
         - Adds new transition to the automaton. 
         If accept_new_elements = False, then a not-yet-existent state or symbol will cause an error
+    - remove_transition(self, from_state, symbol, to_state) / remove_state(self, state)
+        - Removes a transition or a state (with all its transitions) from the automaton
+    - successors(self, state, symbol=None) / predecessors(self, state, symbol=None)
+        - Looks up the neighbours of a state in lazily built, incrementally maintained indexes
     - visualize(self, filename)
         - Plots a .png image of the automaton
-    - reduce_nondeterm(self)
+    - reduce_nondeterm(self, fast_path=True)
         - Performs an algorithm for non-determinism reduction, developed by Ultes-Nitsche
-    - upper_part(self)
+    - upper_part(self, fast_path=True)
         - Performs the first step of the complementation construction in Allred & Ultes-Nitshce's algorithm
+    - classify(self) / reduce_nondeterm_path(self) / upper_part_path(self)
+        - Returns cached structural flags (see Classification), and which algorithm the constructions dispatch to
     - equals(self, other)
         - Checks if two automata are isomorphic, i.e. if there is a bijective mapping between them that preserves the structure. 
     """
@@ -60,6 +96,18 @@ class BuchiAutomaton:
     transitions: Dict[Tuple[str, str], Set[str]] = field(default_factory=dict) # (state, symbol) -> set of target states
     initial_state: str = field(default_factory=str)
     accepting_states: Set[str] = field(default_factory=set)
+    # Lazily built indexes: state -> symbol -> set of target states (resp. source states).
+    # They are kept up to date by add_transition(), remove_transition() and remove_state(),
+    # so self.transitions should not be edited directly once they have been built.
+    _successors: Optional[Dict[str, Dict[str, Set[str]]]] = field(default=None, init=False, repr=False, compare=False)
+    _predecessors: Optional[Dict[str, Dict[str, Set[str]]]] = field(default=None, init=False, repr=False, compare=False)
+    # Copy-on-write bookkeeping: None if this BA owns all its transition buckets, 
+    # otherwise the keys of the buckets that are no longer shared with a copy or snapshot.
+    _owned_buckets: Optional[Set[Tuple[str, str]]] = field(default=None, init=False, repr=False, compare=False)
+    # Lazily computed summary of the transitions, from which classify() derives its flags: 
+    # (non-determinism degree, number of non-empty buckets, the buckets with two target states).
+    # It is dropped by add_transition() and remove_transition(), like the indexes.
+    _summary: Optional[Tuple[int, int, Tuple[FrozenSet[str], ...]]] = field(default=None, init=False, repr=False, compare=False)
 
     def add_transition(self, from_state: str, symbol: str, to_state: str, accept_new_elements: bool = True) -> None:
         """
@@ -90,7 +138,135 @@ class BuchiAutomaton:
         key = (from_state, symbol)
         if key not in self.transitions:
             self.transitions[key] = set()
-        self.transitions[key].add(to_state)
+        self._writable_bucket(key).add(to_state)
+        self._summary = None
+
+        # Keep the neighbour indexes up to date, if they have been built
+        if self._successors is not None:
+            self._successors.setdefault(from_state, {}).setdefault(symbol, set()).add(to_state)
+            self._predecessors.setdefault(to_state, {}).setdefault(symbol, set()).add(from_state)
+
+    def remove_transition(self, from_state: str, symbol: str, to_state: str) -> None:
+        """
+        Removes an existing transition from self.transitions. 
+        The states and the symbol remain in the automaton, even if they are no longer used by any transition.
+
+        Args:
+            from_state (str): The source state of the transition
+            symbol (str): The symbol of the transition
+            to_state (str): The target state of the transition
+
+        Returns:
+            None
+        """
+        key = (from_state, symbol)
+        assert key in self.transitions and to_state in self.transitions[key], "Cannot remove non-existing transition"
+
+        self._writable_bucket(key).discard(to_state)
+        if not self.transitions[key]:
+            del self.transitions[key]
+        self._summary = None
+
+        # Keep the neighbour indexes up to date, if they have been built
+        if self._successors is not None:
+            _discard_from_index(self._successors, from_state, symbol, to_state)
+            _discard_from_index(self._predecessors, to_state, symbol, from_state)
+
+    def remove_state(self, state: str) -> None:
+        """
+        Removes a state from the automaton, together with all transitions from and to it. 
+        If the removed state was the initial state, the initial state is reset to "".
+
+        Args:
+            state (str): The state to remove
+
+        Returns:
+            None
+        """
+        assert state in self.states, "Cannot remove non-existing state"
+
+        # Collect incident transitions via the indexes, before any of them are changed
+        outgoing = [(symbol, to_state) for symbol, to_states in self._successor_index().get(state, {}).items() for to_state in to_states]
+        incoming = [(from_state, symbol) for symbol, from_states in self._predecessor_index().get(state, {}).items() for from_state in from_states]
+        for symbol, to_state in outgoing:
+            self.remove_transition(state, symbol, to_state)
+        for from_state, symbol in incoming:
+            if from_state != state: # Self-loops were already removed as outgoing transitions
+                self.remove_transition(from_state, symbol, state)
+
+        self.states.discard(state)
+        self.accepting_states.discard(state)
+        if self.initial_state == state:
+            self.initial_state = ""
+
+    def _writable_bucket(self, key: Tuple[str, str]) -> Set[str]:
+        """Returns the transition bucket for the given key, copying it first if it is shared with a copy or snapshot."""
+        if self._owned_buckets is not None and key not in self._owned_buckets:
+            self.transitions[key] = set(self.transitions[key])
+            self._owned_buckets.add(key)
+        return self.transitions[key]
+
+    def successors(self, state: str, symbol: Optional[str] = None) -> Set[str]:
+        """
+        Returns the states reachable from the given state in one step.
+
+        Args:
+            state (str): The source state
+            symbol (Optional[str]=None): If given, only transitions labelled with this symbol are considered.
+
+        Returns:
+            Set[str]: The target states. Modifying this set does not affect the automaton.
+        """
+        by_symbol = self._successor_index().get(state, {})
+        if symbol is not None:
+            return set(by_symbol.get(symbol, set()))
+        return set().union(*by_symbol.values())
+
+    def predecessors(self, state: str, symbol: Optional[str] = None) -> Set[str]:
+        """
+        Returns the states from which the given state is reachable in one step.
+
+        Args:
+            state (str): The target state
+            symbol (Optional[str]=None): If given, only transitions labelled with this symbol are considered.
+
+        Returns:
+            Set[str]: The source states. Modifying this set does not affect the automaton.
+        """
+        by_symbol = self._predecessor_index().get(state, {})
+        if symbol is not None:
+            return set(by_symbol.get(symbol, set()))
+        return set().union(*by_symbol.values())
+
+    def _successor_index(self) -> Dict[str, Dict[str, Set[str]]]:
+        """Returns the successor index (state -> symbol -> targets), building both indexes on first use."""
+        if self._successors is None:
+            self._build_indexes()
+        return self._successors
+
+    def _predecessor_index(self) -> Dict[str, Dict[str, Set[str]]]:
+        """Returns the predecessor index (state -> symbol -> sources), building both indexes on first use."""
+        if self._predecessors is None:
+            self._build_indexes()
+        return self._predecessors
+
+    def _build_indexes(self) -> None:
+        """Builds the successor and predecessor indexes with a single scan of self.transitions."""
+        successors = {}
+        predecessors = {}
+        for (from_state, symbol), to_states in self.transitions.items():
+            if not to_states:
+                continue
+            successors.setdefault(from_state, {})[symbol] = set(to_states)
+            for to_state in to_states:
+                predecessors.setdefault(to_state, {}).setdefault(symbol, set()).add(from_state)
+        self._successors = successors
+        self._predecessors = predecessors
+
+    def _invalidate_indexes(self) -> None:
+        """Drops the neighbour indexes, e.g. after self.transitions has been replaced. They are rebuilt on next use."""
+        self._successors = None
+        self._predecessors = None
 
     def visualize(self, filename: str="buchi_automaton") -> None:
         """
@@ -123,37 +299,42 @@ class BuchiAutomaton:
             graph.node(state, shape=shape)
 
         # Add transitions
-        done = set()
-        for (from_state, symbol), to_states in self.transitions.items():
-            for to_state in to_states:
-                if (from_state, to_state) not in done:
-                    # Check if there are multiple symbols leading to the same state
-                    label_symbols = symbol
-                    for other_symbol in self.alphabet:
-                        if (other_symbol is not symbol) and \
-                                ((from_state, other_symbol) in self.transitions) and \
-                                (to_state in self.transitions[(from_state, other_symbol)]):
-                            label_symbols += other_symbol
-                    label = ''.join(sorted(label_symbols))
-                    # Draw the edge labeled with all apropriate symbols
-                    graph.edge(from_state, to_state, taillabel=label, labelfontsize='12', labelangle='15', labeldistance='2')
-                    done.add((from_state, to_state))
+        for from_state, by_symbol in self._successor_index().items():
+            # Group the symbols leading to the same target state, so they share one edge
+            label_symbols = {}
+            for symbol, to_states in by_symbol.items():
+                for to_state in to_states:
+                    label_symbols.setdefault(to_state, []).append(symbol)
+            for to_state, symbols in label_symbols.items():
+                label = ''.join(sorted(symbols))
+                # Draw the edge labeled with all apropriate symbols
+                graph.edge(from_state, to_state, taillabel=label, labelfontsize='12', labelangle='15', labeldistance='2')
 
         graph.render(os.path.join(PLOTTED_BAs_FOLDER_NAME, filename), format="png", cleanup=True)
 
-    def reduce_nondeterm(self) -> "BuchiAutomaton":
+    def reduce_nondeterm(self, fast_path: bool = True) -> "BuchiAutomaton":
         """        
         Executes an algorithm by Ultes-Nitsche to reduce the non-determinism degree of the Büchi automaton. 
         The resulting BA will have non-determinism degree <= 2. Furthermore, if the non-determinism degree is exactly 2,
         a state with two possible transitions for a given symbol will always lead to one accepting state
         and one non-accepting state for this symbol (i.e., it will satisfy property PI).
 
+        If this BA already has property PI (which includes deterministic BAs), every reduced state represents a single \
+        original state, so the result is the reachable part of this BA. It is then built directly, without the general algorithm. \
+        See reduce_nondeterm_path().
+
         This function assumes that the original automaton's state ids does not contain any commas (',').
         This condition can be fullfilled by calling rename_states().
 
+        Args:
+            fast_path (bool=True): If False, the general algorithm is always used. The result is the same.
+
         Returns:
             "BuchiAutomaton": A Büchi automaton that accepts the same language as this, with a non-determinism degree of at most 2
         """
+        if fast_path and self.reduce_nondeterm_path() != GENERAL_PATH:
+            return self._reachable_part()
+
         # Initialize the reduced automaton with the initial state
         reduced_states = set()
         reduced_states.add(self.initial_state)
@@ -171,60 +352,109 @@ class BuchiAutomaton:
 
             # Go through all possible input symbols
             for symbol in self.alphabet:
-                target_states = set()
-                for state in repr_states:
-                    if ((state, symbol) in self.transitions.keys()):
-                        target_states = target_states.union(self.transitions[(state, symbol)])
-                
-                # Split target states into accepting and non-accepting
-                accepting_target_states = []
-                nonacc_target_states = []
-                for target in target_states:
-                    if target in self.accepting_states:
-                        accepting_target_states.append(target)
-                    else:
-                        nonacc_target_states.append(target)
-
-                # Add new transitions in the reduced automaton
-                if accepting_target_states:
-                    # Build string of target state (Sort to avoid duplicates)
-                    new_state = ",".join(sorted(accepting_target_states))
+                for new_state, accepting in self.reduce_nondeterm_successors(repr_states, symbol):
                     # Add target state to to_do list if not already added
                     if (new_state not in done):
                         if (new_state not in to_do):
                             if (not new_state == current_state):
                                to_do.add(new_state)
-                    # Add transition and mark target state as accepting
-                    reduced_ba.add_transition(current_state, symbol, new_state)
-                    reduced_ba.accepting_states.add(new_state)
-                    
-                if nonacc_target_states:
-                    # Build string of target state (Sort to avoid duplicates)
-                    new_state = ",".join(sorted(nonacc_target_states))
-                    # Add target state to to_do list if not already added
-                    if (new_state not in done):
-                        if (new_state not in to_do):
-                            if (not new_state == current_state):
-                               to_do.add(new_state)
-                    # Add transition
+                    # Add transition (and mark target state as accepting)
                     reduced_ba.add_transition(current_state, symbol, new_state)
+                    if accepting:
+                        reduced_ba.accepting_states.add(new_state)
 
             # Mark the current state as checked for transitions
             done.add(current_state)
         
         return reduced_ba
 
-    def upper_part(self) -> "BuchiAutomaton":
+    def reduce_nondeterm_path(self) -> str:
+        """
+        Returns which algorithm reduce_nondeterm() uses for this BA: DETERMINISTIC_PATH or PROPERTY_PI_PATH \
+        if it builds the reachable part directly, or GENERAL_PATH.
+        """
+        classification = self.classify()
+        if classification.is_deterministic:
+            return DETERMINISTIC_PATH
+        if classification.has_property_pi:
+            return PROPERTY_PI_PATH
+        return GENERAL_PATH
+
+    def _reachable_part(self) -> "BuchiAutomaton":
+        """
+        Returns the part of this BA that is reachable from the initial state. \
+        Like in reduce_nondeterm(), a state is only accepting if it is reached by a transition.
+        """
+        reachable_ba = BuchiAutomaton(states={self.initial_state},
+                                      alphabet=self.alphabet,
+                                      initial_state=self.initial_state)
+        to_do = [self.initial_state]
+        while to_do:
+            current_state = to_do.pop()
+            for symbol in self.alphabet:
+                for new_state in self.transitions.get((current_state, symbol), ()):
+                    if new_state not in reachable_ba.states:
+                        to_do.append(new_state)
+                    reachable_ba.add_transition(current_state, symbol, new_state)
+                    if new_state in self.accepting_states:
+                        reachable_ba.accepting_states.add(new_state)
+        return reachable_ba
+
+    def reduce_nondeterm_successors(self, repr_states: List[str], symbol: str) -> List[Tuple[str, bool]]:
+        """
+        Computes the successors of a state of the reduced automaton for a given symbol (see reduce_nondeterm()).
+
+        Args:
+            repr_states (List[str]): The states of the original automaton that the state of the reduced automaton represents
+            symbol (str): The input symbol
+
+        Returns:
+            List[Tuple[str, bool]]: At most two pairs of (target state id, whether it is accepting), \
+                one for the accepting and one for the non-accepting target states
+        """
+        target_states = set()
+        for state in repr_states:
+            if ((state, symbol) in self.transitions.keys()):
+                target_states = target_states.union(self.transitions[(state, symbol)])
+        
+        # Split target states into accepting and non-accepting
+        accepting_target_states = []
+        nonacc_target_states = []
+        for target in target_states:
+            if target in self.accepting_states:
+                accepting_target_states.append(target)
+            else:
+                nonacc_target_states.append(target)
+
+        # Build strings of target states (Sort to avoid duplicates)
+        successors = []
+        if accepting_target_states:
+            successors.append((",".join(sorted(accepting_target_states)), True))
+        if nonacc_target_states:
+            successors.append((",".join(sorted(nonacc_target_states)), False))
+        return successors
+
+    def upper_part(self, fast_path: bool = True) -> "BuchiAutomaton":
         """
         Constructs the upper part A' of the complement automaton, given Büchi Automaton A. \
         This is the first step in the complementation algorithm developed by Allred and Ultes-Nitsche.
 
+        If A is deterministic, every macrostate is a single set with a single state, so A' is the reachable part of A, \
+        with every state q renamed to {q} and no accepting states. It is then built directly, without the general algorithm. \
+        See upper_part_path().
+
         This function assumes that the original automaton's state ids does not contain any commas or curly brackets (, { }).
         This condition can be fullfilled by calling rename_states().
 
+        Args:
+            fast_path (bool=True): If False, the general algorithm is always used. The result is the same.
+
         Returns:
             "BuchiAutomaton": The constructed upper part A'
         """
+        if fast_path and self.upper_part_path() == DETERMINISTIC_PATH:
+            return self._upper_part_deterministic()
+
         # Initialize the reduced automaton with the initial state
         states = set()
         states.add("{"+self.initial_state+"}")
@@ -239,53 +469,12 @@ class BuchiAutomaton:
             current_state = to_do.pop()
 
             # If it contains several sets of states, we need to split them up
-            state_sets = re.findall(r'\{([^}]*)\}', current_state) # identifies groups within curly brackets in a string
-            state_sets.reverse() # to consider the right-most set first
+            state_sets = split_macrostate(current_state)
 
             # Go through all possible input symbols
             for a in self.alphabet:
-
-                # Initialize new state
-                new_state = []  # representing the tuple for the new state
-                included_target_states = set() # To make sure all sets S are pairwise disjoint
-
-                for S in state_sets:
-                    # If the set represents several states from the original automaton, we should consider them all individually
-                    repr_states = S.split(sep=",")
-                    target_states = set()
-                    for q in repr_states:
-                        if ((q, a) in self.transitions.keys()):
-                            target_states.update(self.transitions[(q, a)].difference(included_target_states))
-                    # Make sure target states only get included once
-                    included_target_states.update(target_states)
-
-                    # Split target states into accepting and non-accepting
-                    accepting_target_states = []
-                    nonacc_target_states = []
-                    for target in target_states:
-                        if target in self.accepting_states:
-                            accepting_target_states.append(target)
-                        else:
-                            nonacc_target_states.append(target)
-
-                    # Add new sets to the new state
-                    if accepting_target_states:
-                        # Build string for the accepting target set
-                        accepting_set_string = "{" + ",".join(sorted(accepting_target_states)) + "}"
-                        # Add it to the new state if not already present
-                        if accepting_set_string not in new_state:
-                            new_state.append(accepting_set_string)
-
-                    if nonacc_target_states:
-                        # Build string for the non-accepting target set
-                        nonacc_set_string = "{" + ",".join(sorted(nonacc_target_states)) + "}"
-                        if nonacc_set_string not in new_state:
-                            new_state.append(nonacc_set_string)
-
+                new_state = self.upper_part_successor(state_sets, a)
                 if new_state:
-                    # Build string for new state
-                    new_state.reverse() # Sets were added from right to left
-                    new_state = ",".join(new_state)
                     # Add new state to to_do list if not already added
                     if (new_state not in done) and \
                         (new_state not in to_do) and \
@@ -299,6 +488,123 @@ class BuchiAutomaton:
         
         return upper_part
 
+    def upper_part_path(self) -> str:
+        """
+        Returns which algorithm upper_part() uses for this BA: DETERMINISTIC_PATH or GENERAL_PATH. \
+        With non-determinism degree 2, the macrostates already consist of several sets, so property PI does not help here.
+        """
+        return DETERMINISTIC_PATH if self.classify().is_deterministic else GENERAL_PATH
+
+    def _upper_part_deterministic(self) -> "BuchiAutomaton":
+        """Constructs the upper part of this BA, assuming that it is deterministic (see upper_part())."""
+        initial_state = "{" + self.initial_state + "}"
+        upper_part = BuchiAutomaton(states={initial_state},
+                                    alphabet=self.alphabet,
+                                    initial_state=initial_state)
+        to_do = [self.initial_state]
+        while to_do:
+            current_state = to_do.pop()
+            for a in self.alphabet:
+                for new_state in self.transitions.get((current_state, a), ()):
+                    if "{" + new_state + "}" not in upper_part.states:
+                        to_do.append(new_state)
+                    upper_part.add_transition("{" + current_state + "}", a, "{" + new_state + "}")
+        return upper_part
+
+    def upper_part_successor(self, state_sets: List[List[str]], a: str) -> str:
+        """
+        Computes the a-successor of a macrostate in the upper part construction (see upper_part()).
+
+        The successor only depends on the entries (q, a) of self.transitions for the states q in the macrostate, \
+        and on which of their target states are accepting.
+
+        Args:
+            state_sets (List[List[str]]): The sets of the macrostate, from left to right (see split_macrostate())
+            a (str): The input symbol
+
+        Returns:
+            str: The state id of the successor macrostate, or "" if the macrostate has no a-successor
+        """
+        # Initialize new state
+        new_state = []  # representing the tuple for the new state
+        included_target_states = set() # To make sure all sets S are pairwise disjoint
+
+        for repr_states in reversed(state_sets): # to consider the right-most set first
+            # If the set represents several states from the original automaton, we should consider them all individually
+            target_states = set()
+            for q in repr_states:
+                if ((q, a) in self.transitions.keys()):
+                    target_states.update(self.transitions[(q, a)].difference(included_target_states))
+            # Make sure target states only get included once
+            included_target_states.update(target_states)
+
+            # Split target states into accepting and non-accepting
+            accepting_target_states = []
+            nonacc_target_states = []
+            for target in target_states:
+                if target in self.accepting_states:
+                    accepting_target_states.append(target)
+                else:
+                    nonacc_target_states.append(target)
+
+            # Add new sets to the new state
+            if accepting_target_states:
+                # Build string for the accepting target set
+                accepting_set_string = "{" + ",".join(sorted(accepting_target_states)) + "}"
+                # Add it to the new state if not already present
+                if accepting_set_string not in new_state:
+                    new_state.append(accepting_set_string)
+
+            if nonacc_target_states:
+                # Build string for the non-accepting target set
+                nonacc_set_string = "{" + ",".join(sorted(nonacc_target_states)) + "}"
+                if nonacc_set_string not in new_state:
+                    new_state.append(nonacc_set_string)
+
+        # Build string for new state
+        new_state.reverse() # Sets were added from right to left
+        return ",".join(new_state)
+
+    def minimize(self) -> "BuchiAutomaton":
+        """
+        Constructs the quotient of this BA by bisimulation, which accepts the same language. \
+        Two states are merged if they agree on acceptance, and for every symbol, \
+        their target states can be matched up with each other pairwise in the same way.
+
+        Every state of the quotient is named after the smallest state id of the states it merges.
+
+        Returns:
+            "BuchiAutomaton": The minimized BA
+        """
+        # Start by separating accepting from non-accepting states, and refine until nothing changes
+        block = {state: int(state in self.accepting_states) for state in self.states}
+        n_blocks = len(set(block.values()))
+        while True:
+            signatures = {}
+            for state in self.states:
+                successor_blocks = tuple(sorted(
+                    (symbol, tuple(sorted(set(block[target] for target in to_states))))
+                    for symbol, to_states in self._successor_index().get(state, {}).items()))
+                signatures[state] = (block[state], successor_blocks)
+            numbering = {sig: i for i, sig in enumerate(sorted(set(signatures.values())))}
+            block = {state: numbering[signatures[state]] for state in self.states}
+            if len(numbering) == n_blocks:
+                break
+            n_blocks = len(numbering)
+
+        # Name each block after its smallest member
+        names = {}
+        for state in sorted(self.states):
+            names.setdefault(block[state], state)
+        minimized = BuchiAutomaton(states=set(names.values()),
+                                   alphabet=set(self.alphabet),
+                                   initial_state=names[block[self.initial_state]] if self.initial_state in self.states else "",
+                                   accepting_states={names[block[state]] for state in self.accepting_states})
+        for (from_state, symbol), to_states in self.transitions.items():
+            for to_state in to_states:
+                minimized.add_transition(names[block[from_state]], symbol, names[block[to_state]])
+        return minimized
+
     def rename_states(self) -> None:
         """Renames the states of this BuchiAutomaton to simply "0", "1", "2", ..."""
         old_states = list(self.states)
@@ -317,6 +623,9 @@ class BuchiAutomaton:
         self.transitions = transitions
         self.initial_state = initial_state
         self.accepting_states = accepting_states
+        self._invalidate_indexes()
+        self._owned_buckets = None
+        self._summary = None
 
     def is_valid(self) -> bool:
         """
@@ -361,23 +670,94 @@ class BuchiAutomaton:
                 else:
                     return False
         return True
+
+    def nondeterminism_degree(self) -> int:
+        """
+        Returns the non-determinism degree of this BA, i.e. the maximum number of target states \
+        of a single state and symbol.
+
+        Returns:
+            int: The non-determinism degree (0 if there are no transitions)
+        """
+        return self._transition_summary()[0]
+
+    def has_property_pi(self) -> bool:
+        """
+        Checks if this BA has non-determinism degree <= 2 and property PI, i.e. whenever a state has two \
+        possible transitions for a given symbol, one of them leads to an accepting state and the other one does not.
+
+        Returns:
+            bool: True if this BA has property PI, False if not.
+        """
+        degree, _, branching_buckets = self._transition_summary()
+        if degree > 2:
+            return False
+        return all(len(to_states.intersection(self.accepting_states)) == 1 for to_states in branching_buckets)
+
+    def classify(self) -> "Classification":
+        """
+        Classifies the structure of this BA. The part that depends on the transitions is computed once, \
+        and kept until the transitions are edited. The accepting states, states and alphabet are looked up on every call, \
+        since they can be edited directly.
+
+        Returns:
+            "Classification": The structural flags of this BA
+        """
+        degree, n_buckets, _ = self._transition_summary()
+        return Classification(nondeterminism_degree=degree,
+                              is_deterministic=degree <= 1,
+                              has_property_pi=self.has_property_pi(),
+                              # Every non-empty bucket of a valid BA belongs to one of the state-symbol pairs
+                              is_complete=n_buckets == len(self.states) * len(self.alphabet))
+
+    def _transition_summary(self) -> Tuple[int, int, Tuple[FrozenSet[str], ...]]:
+        """Returns the non-determinism degree, the number of non-empty buckets and the buckets with two targets, computing them on first use."""
+        if self._summary is None:
+            buckets = [to_states for to_states in self.transitions.values() if to_states]
+            self._summary = (max((len(to_states) for to_states in buckets), default=0),
+                             len(buckets),
+                             tuple(frozenset(to_states) for to_states in buckets if len(to_states) == 2))
+        return self._summary
     
     def copy(self) -> "BuchiAutomaton":
         """
         Returns a copy of this BA-object.
 
+        The copy is independent of this BA, but cheap to make: the transition buckets (the target sets) \
+        are shared between both automata, and only copied by the one that first edits them through \
+        add_transition(), remove_transition() or remove_state().
+
         Returns:
             "BuchiAutomaton": A copy of this BA
         """
         copy = BuchiAutomaton(
-            states=self.states,
-            alphabet=self.alphabet,
-            transitions=self.transitions,
+            states=set(self.states),
+            alphabet=set(self.alphabet),
+            transitions=dict(self.transitions),
             initial_state=self.initial_state,
-            accepting_states=self.accepting_states
+            accepting_states=set(self.accepting_states)
         )
+        # From now on, all buckets are shared between the two automata
+        copy._owned_buckets = set()
+        self._owned_buckets = set()
+        copy._summary = self._summary
         return copy
 
+    def freeze(self) -> "FrozenBuchiAutomaton":
+        """
+        Returns an immutable snapshot of this BA. The snapshot is hashable, so it can be used as a cache key.
+
+        Returns:
+            "FrozenBuchiAutomaton": The snapshot
+        """
+        return FrozenBuchiAutomaton(
+            states=frozenset(self.states),
+            alphabet=frozenset(self.alphabet),
+            transitions=frozenset((key, frozenset(to_states)) for key, to_states in self.transitions.items() if to_states),
+            initial_state=self.initial_state,
+            accepting_states=frozenset(self.accepting_states)
+        )
+
     def __str__(self):
         """The string representation of this BA."""
         def transitions_str():
@@ -419,7 +799,7 @@ class BuchiAutomaton:
         G2 = other.to_nx_graph()
 
         node_match = lambda n1, n2: n1 == n2
-        edge_match = lambda e1, e2: e1['symbol'] == e2['symbol']
+        edge_match = lambda e1, e2: e1['symbols'] == e2['symbols']
 
         matcher = DiGraphMatcher(G1, G2, node_match=node_match, edge_match=edge_match)
         return matcher
@@ -433,7 +813,11 @@ class BuchiAutomaton:
                     is_accepting=state in self.accepting_states)
         for (from_state, symbol), targets in self.transitions.items():
             for tgt in targets:
-                G.add_edge(from_state, tgt, symbol=symbol)
+                # Several symbols can lead from one state to the same target, so collect them all on the edge
+                if G.has_edge(from_state, tgt):
+                    G.edges[from_state, tgt]['symbols'] = G.edges[from_state, tgt]['symbols'] | {symbol}
+                else:
+                    G.add_edge(from_state, tgt, symbols=frozenset({symbol}))
         return G
     
     def print_mapping(self, other: "BuchiAutomaton") -> None:
@@ -456,6 +840,62 @@ class BuchiAutomaton:
             print("No isomorphism found.")
             return
     
+@dataclass(frozen=True)
+class FrozenBuchiAutomaton:
+    """Immutable, hashable snapshot of a BuchiAutomaton, created by BuchiAutomaton.freeze().
+
+    Two snapshots are equal if their states, alphabet, transitions, initial state and accepting states are equal. \
+    Note that this is plain equality of the state ids, not isomorphism (see BuchiAutomaton.equals()).
+
+    :Fields:
+    - states: FrozenSet[str]
+    - alphabet: FrozenSet[str]
+    - transitions: FrozenSet[Tuple[Tuple[str, str], FrozenSet[str]]]
+    - initial_state: str
+    - accepting_states: FrozenSet[str]
+    """
+    states: FrozenSet[str] = frozenset()
+    alphabet: FrozenSet[str] = frozenset()
+    transitions: FrozenSet[Tuple[Tuple[str, str], FrozenSet[str]]] = frozenset() # ((state, symbol), set of target states)
+    initial_state: str = ""
+    accepting_states: FrozenSet[str] = frozenset()
+
+    def thaw(self) -> BuchiAutomaton:
+        """
+        Returns an editable BuchiAutomaton with the contents of this snapshot. 
+        The transition buckets are shared with the snapshot until they are edited.
+
+        Returns:
+            BuchiAutomaton: The editable BA
+        """
+        ba = BuchiAutomaton(
+            states=set(self.states),
+            alphabet=set(self.alphabet),
+            transitions=dict(self.transitions),
+            initial_state=self.initial_state,
+            accepting_states=set(self.accepting_states)
+        )
+        ba._owned_buckets = set()
+        return ba
+
+@dataclass(frozen=True)
+class Classification:
+    """Structural flags of a BuchiAutomaton, returned by BuchiAutomaton.classify().
+
+    :Fields:
+    - nondeterminism_degree: int
+    - is_deterministic: bool
+        - True if every state has at most one target state per symbol
+    - has_property_pi: bool
+        - See BuchiAutomaton.has_property_pi()
+    - is_complete: bool
+        - See BuchiAutomaton.is_complete(). Only reliable for valid BAs.
+    """
+    nondeterminism_degree: int
+    is_deterministic: bool
+    has_property_pi: bool
+    is_complete: bool
+
 if __name__ == "__main__":
     from ba_generator import generate_ba
 
@@ -604,4 +1044,121 @@ if __name__ == "__main__":
         accepting_states={'2'}   
     )
     assert not ba.is_complete()
-    print("Test passed!")
\ No newline at end of file
+    print("Test passed!")
+    # Test: Successor and predecessor indexes
+    print("Neighbour indexes are kept up to date...")
+    ba = BuchiAutomaton(
+        states={'1','2'},
+        alphabet={'a','b'},
+        transitions={('1','a'): {'1'},
+                     ('1','b'): {'2'},
+                     ('2','a'): {'2'},
+                     ('2','b'): {'1', '2'}},
+        initial_state='1',
+        accepting_states={'2'}   
+    )
+    assert ba.successors('1') == {'1', '2'}
+    assert ba.predecessors('1') == {'1', '2'}
+    assert ba.predecessors('2', 'a') == {'2'}
+    ba.add_transition('2', 'c', '3')
+    assert ba.successors('2') == {'1', '2', '3'}
+    assert ba.predecessors('3') == {'2'}
+    ba.remove_transition('2', 'b', '1')
+    assert ba.successors('2', 'b') == {'2'}
+    assert ba.predecessors('1') == {'1'}
+    ba.remove_state('2')
+    assert ba.states == {'1', '3'} and ba.accepting_states == set()
+    assert ba.transitions == {('1','a'): {'1'}}
+    assert ba.successors('1') == {'1'} and ba.predecessors('3') == set()
+    assert ba.is_valid()
+    print("Test passed!")
+
+    # Test: Copies and snapshots are independent of the original
+    print("Copies and snapshots do not share edits...")
+    ba = BuchiAutomaton(
+        states={'1','2'},
+        alphabet={'a','b'},
+        transitions={('1','a'): {'1'},
+                     ('1','b'): {'2'},
+                     ('2','a'): {'2'},
+                     ('2','b'): {'2'}},
+        initial_state='1',
+        accepting_states={'2'}   
+    )
+    snapshot = ba.freeze()
+    other = ba.copy()
+    other.add_transition('1', 'a', '2')
+    other.remove_transition('2', 'b', '2')
+    other.accepting_states.add('1')
+    assert ba.transitions[('1','a')] == {'1'} and ('2','b') in ba.transitions
+    assert ba.accepting_states == {'2'}
+    ba.add_transition('2', 'b', '1')
+    assert other.transitions.get(('2','b')) is None
+    assert snapshot == BuchiAutomaton(
+        states={'1','2'},
+        alphabet={'a','b'},
+        transitions={('1','a'): {'1'},
+                     ('1','b'): {'2'},
+                     ('2','a'): {'2'},
+                     ('2','b'): {'2'}},
+        initial_state='1',
+        accepting_states={'2'}   
+    ).freeze()
+    assert snapshot != ba.freeze()
+    assert hash(snapshot) == hash(snapshot.thaw().freeze())
+    thawed = snapshot.thaw()
+    thawed.add_transition('1', 'b', '1')
+    assert snapshot.thaw().transitions[('1','b')] == {'2'}
+    assert thawed.equals(thawed.freeze().thaw())
+    print("Test passed!")
+
+    # Test: Non-determinism degree, property PI and minimization
+    print("Reduction leads to property PI, and minimization merges bisimilar states...")
+    ba = BuchiAutomaton(
+        states={'1','2','3'},
+        alphabet={'a'},
+        transitions={('1','a'): {'2','3'},
+                     ('2','a'): {'2'},
+                     ('3','a'): {'3'}},
+        initial_state='1',
+        accepting_states={'2','3'}   
+    )
+    assert ba.nondeterminism_degree() == 2 and not ba.has_property_pi()
+    assert ba.reduce_nondeterm().has_property_pi()
+    minimized = ba.minimize()
+    assert minimized.states == {'1','2'} and minimized.transitions == {('1','a'): {'2'}, ('2','a'): {'2'}}
+    assert minimized.minimize() == minimized
+    print("Test passed!")
+
+    # Test: The fast paths give the same results as the general algorithms, and the flags follow edits
+    print("Fast paths match the general constructions...")
+    ba = BuchiAutomaton(
+        states={'1','2','3'},
+        alphabet={'a','b'},
+        transitions={('1','a'): {'2'},
+                     ('1','b'): {'1'},
+                     ('2','a'): {'2'},
+                     ('2','b'): {'1'}},
+        initial_state='1',
+        accepting_states={'1','3'}   
+    )
+    assert ba.classify() == Classification(nondeterminism_degree=1, is_deterministic=True, has_property_pi=True, is_complete=False)
+    assert ba.reduce_nondeterm_path() == DETERMINISTIC_PATH and ba.upper_part_path() == DETERMINISTIC_PATH
+    assert ba.reduce_nondeterm().freeze() == ba.reduce_nondeterm(fast_path=False).freeze()
+    assert ba.upper_part().freeze() == ba.upper_part(fast_path=False).freeze()
+    ba.add_transition('1', 'a', '3')
+    assert ba.reduce_nondeterm_path() == PROPERTY_PI_PATH and ba.upper_part_path() == GENERAL_PATH
+    assert ba.reduce_nondeterm().freeze() == ba.reduce_nondeterm(fast_path=False).freeze()
+    ba.accepting_states.discard('3')
+    assert ba.reduce_nondeterm_path() == GENERAL_PATH
+    ba.add_transition('3', 'a', '3')
+    ba.add_transition('3', 'b', '3')
+    assert ba.classify().is_complete and ba.copy().classify() == ba.classify()
+    for _ in range(200):
+        ba = generate_ba(max_nondet_degree=2)
+        reduced_ba = ba.reduce_nondeterm()
+        reduced_ba.rename_states() # The state ids of R contain commas
+        for fast_path_ba in (ba, reduced_ba):
+            assert fast_path_ba.reduce_nondeterm().freeze() == fast_path_ba.reduce_nondeterm(fast_path=False).freeze()
+            assert fast_path_ba.upper_part().freeze() == fast_path_ba.upper_part(fast_path=False).freeze()
+    print("Test passed!")
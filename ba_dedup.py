@@ -0,0 +1,176 @@
+"""Script for deduplicating collections of Büchi automata up to isomorphism.
+
+Checking every pair of automata with BuchiAutomaton.equals() is quadratic in the size of the collection.
+Instead, this file sorts automata into bins by a cheap signature that is invariant under isomorphism
+(number of states, transitions and accepting states, degree sequences, and a Weisfeiler-Lehman hash
+over the symbol-labelled transitions). The exact isomorphism check is then only run within a bin.
+
+Running this file deduplicates the saved BAs and a number of generated BAs, and prints the class sizes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from ba import BuchiAutomaton
+import hashlib
+
+# Number of refinement rounds in the Weisfeiler-Lehman hash
+WL_ITERATIONS = 3
+
+def _digest(text: str) -> str:
+    """Returns a short, process-independent hash of the given text."""
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+def signature(ba: BuchiAutomaton, wl_iterations: int = WL_ITERATIONS) -> str:
+    """
+    Computes a signature of the BA, which is equal for any two isomorphic BAs.
+    Two BAs with equal signatures are very likely, but not guaranteed, to be isomorphic.
+
+    Args:
+        ba (BuchiAutomaton): The BA
+        wl_iterations (int=WL_ITERATIONS): The number of refinement rounds in the Weisfeiler-Lehman hash
+
+    Returns:
+        str: The signature, starting with the number of states, transitions and accepting states
+    """
+    n_transitions = sum(len(to_states) for to_states in ba.transitions.values())
+    out_degrees = sorted(len(ba.successors(state)) for state in ba.states)
+    in_degrees = sorted(len(ba.predecessors(state)) for state in ba.states)
+
+    # Initial labels only tell initial and accepting states apart
+    labels = {state: f"{state == ba.initial_state:d}{state in ba.accepting_states:d}" for state in ba.states}
+    for _ in range(wl_iterations):
+        new_labels = {}
+        for state in ba.states:
+            # Combine the state's label with the (sorted) labels of its neighbours, marked with the transition symbols
+            outgoing = sorted(f"{symbol}>{labels[target]}" for symbol in ba.alphabet for target in ba.successors(state, symbol))
+            incoming = sorted(f"{symbol}<{labels[source]}" for symbol in ba.alphabet for source in ba.predecessors(state, symbol))
+            new_labels[state] = _digest(labels[state] + "|" + ",".join(outgoing) + "|" + ",".join(incoming))
+        labels = new_labels
+
+    invariants = [
+        ",".join(sorted(ba.alphabet)),
+        ",".join(map(str, out_degrees)),
+        ",".join(map(str, in_degrees)),
+        ",".join(sorted(labels.values())),
+    ]
+    return f"{len(ba.states)}-{n_transitions}-{len(ba.accepting_states)}-{_digest('|'.join(invariants))}"
+
+@dataclass
+class IsomorphismClass:
+    """A class of isomorphic BAs, as collected by an IsomorphismIndex.
+
+    :Fields:
+    - representative: BuchiAutomaton
+    - size: int
+    """
+    representative: BuchiAutomaton
+    size: int = 1
+
+@dataclass
+class IsomorphismIndex:
+    """Index that groups BAs into isomorphism classes.
+
+    BAs are binned by their signature(), and only compared by BuchiAutomaton.equals() within a bin.
+
+    :Important methods:
+    - add(self, ba)
+        - Adds a BA to the index, and returns the id of its isomorphism class
+    - class_sizes(self)
+        - Returns the number of added BAs per isomorphism class
+    - representatives(self)
+        - Returns one BA per isomorphism class
+    """
+    classes: List[IsomorphismClass] = field(default_factory=list)
+    bins: Dict[str, List[int]] = field(default_factory=dict) # signature -> ids of the classes with that signature
+
+    def add(self, ba: BuchiAutomaton) -> Tuple[int, bool]:
+        """
+        Adds a BA to the index.
+
+        Args:
+            ba (BuchiAutomaton): The BA to add. If it starts a new class, it is stored as the class representative.
+
+        Returns:
+            Tuple[int, bool]: The id of the isomorphism class of the BA, and whether that class is new
+        """
+        sig = signature(ba)
+        class_id = self._find(ba, sig)
+        if class_id is not None:
+            self.classes[class_id].size += 1
+            return class_id, False
+        class_id = len(self.classes)
+        self.classes.append(IsomorphismClass(representative=ba))
+        self.bins.setdefault(sig, []).append(class_id)
+        return class_id, True
+
+    def find(self, ba: BuchiAutomaton) -> int | None:
+        """
+        Looks up the isomorphism class of a BA, without adding it.
+
+        Args:
+            ba (BuchiAutomaton): The BA to look up
+
+        Returns:
+            (int | None): The id of the isomorphism class of the BA, or None if no isomorphic BA has been added
+        """
+        return self._find(ba, signature(ba))
+
+    def _find(self, ba: BuchiAutomaton, sig: str) -> int | None:
+        """Like find(), for a BA whose signature has already been computed."""
+        for class_id in self.bins.get(sig, []):
+            if ba.equals(self.classes[class_id].representative):
+                return class_id
+        return None
+
+    def class_sizes(self) -> List[int]:
+        """Returns the number of added BAs per isomorphism class, indexed by class id."""
+        return [c.size for c in self.classes]
+
+    def representatives(self) -> List[BuchiAutomaton]:
+        """Returns one BA per isomorphism class, indexed by class id."""
+        return [c.representative for c in self.classes]
+
+    def __len__(self) -> int:
+        """The number of distinct isomorphism classes."""
+        return len(self.classes)
+
+    def __contains__(self, ba: BuchiAutomaton) -> bool:
+        """Checks if a BA isomorphic to the given one has been added."""
+        return self.find(ba) is not None
+
+if __name__ == "__main__":
+    from ba_generator import generate_ba
+    from ba_saver import load_ba, BA_FOLDER_NAME
+    from tqdm import tqdm
+    import os
+
+    # Test: Renamed BAs end up in the same class
+    print("Renamed BAs are deduplicated...")
+    index = IsomorphismIndex()
+    ba = generate_ba()
+    renamed = ba.copy()
+    renamed.rename_states()
+    assert signature(ba) == signature(renamed)
+    assert index.add(ba) == (0, True)
+    assert index.add(renamed) == (0, False)
+    assert index.class_sizes() == [2]
+    print("Test passed!")
+
+    # Test: Different symbols on the same edge are told apart
+    print("Symbols are part of the structure...")
+    index = IsomorphismIndex()
+    ba_a = BuchiAutomaton(states={'1'}, alphabet={'a','b'}, transitions={('1','a'): {'1'}}, initial_state='1')
+    ba_b = BuchiAutomaton(states={'1'}, alphabet={'a','b'}, transitions={('1','b'): {'1'}}, initial_state='1')
+    index.add(ba_a)
+    assert ba_b not in index
+    print("Test passed!")
+
+    # Deduplicate the saved BAs and a batch of generated BAs
+    index = IsomorphismIndex()
+    for filename in sorted(os.listdir(BA_FOLDER_NAME)):
+        index.add(load_ba(filename))
+    print(f"{len(index)} distinct classes among the saved BAs.")
+    for _ in tqdm(range(1000)):
+        index.add(generate_ba())
+    print(f"{len(index)} distinct classes after adding 1000 generated BAs.")
+    print(f"Largest class sizes: {sorted(index.class_sizes(), reverse=True)[:10]}")
@@ -0,0 +1,196 @@
+"""Script for computing structural statistics of many Büchi automata at once.
+
+To study which automata break a hypothesis, we want statistics per automaton, such as its non-determinism degree,
+completeness and number of (accepting) strongly connected components (SCCs). Instead of computing them one
+BuchiAutomaton at a time, this file stacks a batch of BAs into NumPy arrays, and computes the statistics for the
+whole batch in vectorized form:
+- adjacency: bool array of shape (batch, symbols, states, states), True where a transition exists
+- the states and symbols of each BA are sorted, and smaller BAs are padded with unused states and symbols
+
+The result is a table with one row per BA, as a NumPy structured array. It contains the canonical hash of each BA
+(see ba_dedup.signature()), so it can be joined with the results of a campaign (see campaign_store.py).
+The sizes of R and U(A) require the actual constructions, so they are only computed on request.
+
+Running this file prints the statistics of the saved BAs.
+"""
+
+from dataclasses import dataclass
+from typing import List
+from ba import BuchiAutomaton
+from ba_dedup import signature
+import numpy as np
+
+# Number of BAs that are stacked into arrays at once
+CHUNK_SIZE = 100_000
+
+STATISTICS_DTYPE = np.dtype([
+    ("canonical_hash", "U40"),
+    ("n_states", np.int32),
+    ("n_transitions", np.int32),
+    ("nondeterminism_degree", np.int32),
+    ("is_complete", np.bool_),
+    ("n_sccs", np.int32),
+    ("n_accepting_sccs", np.int32),
+    ("reduced_size", np.int32),     # -1 if not computed
+    ("upper_part_size", np.int32),  # -1 if not computed
+])
+
+@dataclass
+class StackedBAs:
+    """A batch of BAs, stacked into NumPy arrays.
+
+    :Fields:
+    - adjacency: np.ndarray
+        - bool, shape (batch, symbols, states, states)
+    - accepting: np.ndarray
+        - bool, shape (batch, states)
+    - state_mask: np.ndarray
+        - bool, shape (batch, states). False for padding.
+    - symbol_mask: np.ndarray
+        - bool, shape (batch, symbols). False for padding.
+    """
+    adjacency: np.ndarray
+    accepting: np.ndarray
+    state_mask: np.ndarray
+    symbol_mask: np.ndarray
+
+def stack_bas(bas: List[BuchiAutomaton]) -> StackedBAs:
+    """
+    Stacks a batch of BAs into NumPy arrays.
+
+    Args:
+        bas (List[BuchiAutomaton]): The BAs
+
+    Returns:
+        StackedBAs: The stacked BAs
+    """
+    n_states = max((len(ba.states) for ba in bas), default=0)
+    n_symbols = max((len(ba.alphabet) for ba in bas), default=0)
+    stacked = StackedBAs(
+        adjacency=np.zeros((len(bas), n_symbols, n_states, n_states), dtype=np.bool_),
+        accepting=np.zeros((len(bas), n_states), dtype=np.bool_),
+        state_mask=np.zeros((len(bas), n_states), dtype=np.bool_),
+        symbol_mask=np.zeros((len(bas), n_symbols), dtype=np.bool_),
+    )
+    # Collect the indices of all entries first, and set them with one assignment per array
+    transition_indices = ([], [], [], [])
+    accepting_indices = ([], [])
+    for b, ba in enumerate(bas):
+        state_index = {state: i for i, state in enumerate(sorted(ba.states))}
+        symbol_index = {symbol: k for k, symbol in enumerate(sorted(ba.alphabet))}
+        for state in ba.accepting_states:
+            accepting_indices[0].append(b)
+            accepting_indices[1].append(state_index[state])
+        for (from_state, symbol), to_states in ba.transitions.items():
+            for to_state in to_states:
+                transition_indices[0].append(b)
+                transition_indices[1].append(symbol_index[symbol])
+                transition_indices[2].append(state_index[from_state])
+                transition_indices[3].append(state_index[to_state])
+    stacked.adjacency[transition_indices] = True
+    stacked.accepting[accepting_indices] = True
+    stacked.state_mask[:] = np.arange(n_states) < np.array([len(ba.states) for ba in bas], dtype=np.int64)[:, None]
+    stacked.symbol_mask[:] = np.arange(n_symbols) < np.array([len(ba.alphabet) for ba in bas], dtype=np.int64)[:, None]
+    return stacked
+
+def _reachability(stacked: StackedBAs) -> np.ndarray:
+    """Returns, per BA, whether state j is reachable from state i by a non-empty path. Shape (batch, states, states)."""
+    step = stacked.adjacency.any(axis=1).astype(np.float32)
+    reach = step.copy()
+    # Paths of length <= 2^k, for increasing k, via batched matrix products
+    for _ in range(max(int(np.ceil(np.log2(max(reach.shape[-1], 1)))) + 1, 1)):
+        reach = np.minimum(reach + reach @ reach, 1)
+    return reach > 0
+
+def compute_statistics(bas: List[BuchiAutomaton], canonical_hashes: List[str] | None = None, with_hashes: bool = True, with_constructions: bool = False) -> np.ndarray:
+    """
+    Computes structural statistics of a batch of BAs, all but the construction sizes in vectorized form.
+
+    An SCC is counted as accepting if it contains an accepting state and a cycle, i.e. if a run can visit it infinitely often. \
+    All states of a BA are taken into account, also if they are not reachable from the initial state.
+
+    Args:
+        bas (List[BuchiAutomaton]): The BAs
+        canonical_hashes (List[str] | None=None): The canonical hashes of the BAs, if already known (e.g. from a campaign store)
+        with_hashes (bool=True): Set to False to leave the canonical hashes empty, if they are neither given nor needed. \
+            Computing them is not vectorized, and takes most of the time.
+        with_constructions (bool=False): Set to True to also compute the sizes of R and U(A). Warning: This is not vectorized, and much slower.
+
+    Returns:
+        np.ndarray: Structured array with one row per BA, with the fields of STATISTICS_DTYPE
+    """
+    table = np.zeros(len(bas), dtype=STATISTICS_DTYPE)
+    for start in range(0, len(bas), CHUNK_SIZE):
+        chunk = bas[start:start + CHUNK_SIZE]
+        rows = table[start:start + len(chunk)]
+        stacked = stack_bas(chunk)
+        valid = stacked.symbol_mask[:, :, None] & stacked.state_mask[:, None, :] # (batch, symbols, states)
+
+        out_degrees = stacked.adjacency.sum(axis=3) # (batch, symbols, states)
+        rows["n_states"] = stacked.state_mask.sum(axis=1)
+        rows["n_transitions"] = out_degrees.sum(axis=(1, 2))
+        rows["nondeterminism_degree"] = out_degrees.max(axis=(1, 2), initial=0)
+        rows["is_complete"] = ((out_degrees > 0) | ~valid).all(axis=(1, 2))
+
+        # Two states are in the same SCC if they reach each other. Each SCC is represented by its state with the lowest index.
+        reach = _reachability(stacked)
+        n = reach.shape[-1]
+        same_scc = (reach & reach.transpose(0, 2, 1)) | np.eye(n, dtype=np.bool_)
+        representative = ~(same_scc & np.tri(n, k=-1, dtype=np.bool_)).any(axis=2) & stacked.state_mask
+        rows["n_sccs"] = representative.sum(axis=1)
+        has_cycle = reach[:, np.arange(n), np.arange(n)]
+        scc_is_accepting = (same_scc & stacked.accepting[:, None, :]).any(axis=2) & has_cycle
+        rows["n_accepting_sccs"] = (representative & scc_is_accepting).sum(axis=1)
+
+    if canonical_hashes is not None:
+        table["canonical_hash"] = canonical_hashes
+    elif with_hashes:
+        table["canonical_hash"] = [signature(ba) for ba in bas]
+    if with_constructions:
+        table["reduced_size"] = [len(ba.reduce_nondeterm().states) for ba in bas]
+        table["upper_part_size"] = [len(ba.upper_part().states) for ba in bas]
+    else:
+        table["reduced_size"] = table["upper_part_size"] = -1
+    return table
+
+def to_parquet(table: np.ndarray, path: str) -> None:
+    """
+    Writes a statistics table to a Parquet file. This requires the library pyarrow.
+
+    Args:
+        table (np.ndarray): The statistics, as returned by compute_statistics()
+        path (str): The file to write to
+
+    Returns:
+        None
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    pq.write_table(pa.table({name: table[name] for name in table.dtype.names}), path)
+
+if __name__ == "__main__":
+    from ba_generator import generate_ba
+    from ba_saver import load_ba, BA_FOLDER_NAME
+    import networkx as nx
+    import os
+
+    # Test: The vectorized statistics match the ones computed per BA
+    print("Vectorized statistics match the per-BA ones...")
+    bas = [generate_ba(min_n_states=1, max_n_states=7, min_nondet_degree=0, max_n_acc_states=3) for _ in range(500)]
+    table = compute_statistics(bas, with_hashes=False)
+    for row, ba in zip(table, bas):
+        graph = ba.to_nx_graph()
+        sccs = list(nx.strongly_connected_components(graph))
+        accepting_sccs = [scc for scc in sccs if scc & ba.accepting_states and
+                          (len(scc) > 1 or graph.has_edge(next(iter(scc)), next(iter(scc))))]
+        assert row["nondeterminism_degree"] == ba.nondeterminism_degree()
+        assert row["is_complete"] == ba.is_complete()
+        assert row["n_sccs"] == len(sccs)
+        assert row["n_accepting_sccs"] == len(accepting_sccs)
+    print("Test passed!")
+
+    filenames = sorted(os.listdir(BA_FOLDER_NAME))
+    table = compute_statistics([load_ba(filename) for filename in filenames], with_constructions=True)
+    print("\t".join(["filename"] + list(STATISTICS_DTYPE.names[1:])))
+    for filename, row in zip(filenames, table):
+        print("\t".join([filename] + [str(row[name]) for name in STATISTICS_DTYPE.names[1:]]))
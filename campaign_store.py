@@ -0,0 +1,271 @@
+"""Script for storing the results of equality check campaigns in a local SQLite database.
+
+A campaign checks many generated BAs, the i-th one generated from the seed campaign_seed(campaign, i). For every checked BA,
+the store records i (as "seed"), the generator parameters, its canonical hash (see ba_dedup.signature()), the result,
+the sizes and timings of the constructions, and the BA itself (as a FrozenBuchiAutomaton, without any cached indexes).
+
+Rows are buffered and written in batches, each inside a single transaction, so writing does not
+become the bottleneck of a campaign. The progress of each campaign (the last seed that was either checked or skipped)
+is written in the same transactions, so an interrupted campaign can be resumed after its last committed seed (see last_seed()).
+
+Running this file prints a summary of all campaigns in the given database.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from ba import BuchiAutomaton
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+
+CAMPAIGN_DB_FILENAME = "campaigns.sqlite"
+# Number of buffered rows that triggers a write to the database
+BATCH_SIZE = 500
+# Maximum number of canonical hashes whose checked BAs are kept in memory by is_checked()
+CANDIDATE_CACHE_SIZE = 10_000
+
+# Construction sizes and timings, as measured by equality_check.measure_equal_check()
+MEASUREMENT_COLUMNS = [
+    "reduced_size",
+    "upper_part_size",
+    "reduced_upper_part_size",
+    "reduce_time",
+    "upper_part_time",
+    "reduced_upper_part_time",
+    "equals_time",
+]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS checks (
+    campaign TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    canonical_hash TEXT NOT NULL,
+    n_states INTEGER NOT NULL,
+    n_transitions INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    {", ".join(f"{column} REAL" for column in MEASUREMENT_COLUMNS)},
+    checked_at REAL NOT NULL,
+    automaton BLOB,
+    PRIMARY KEY (campaign, seed)
+);
+CREATE INDEX IF NOT EXISTS checks_by_hash ON checks (canonical_hash);
+CREATE TABLE IF NOT EXISTS progress (
+    campaign TEXT PRIMARY KEY,
+    last_seed INTEGER NOT NULL
+);
+"""
+
+def campaign_seed(campaign: str, i: int) -> int:
+    """Returns the random seed of the i-th BA of a campaign. Different campaigns get different streams of BAs."""
+    return int.from_bytes(hashlib.blake2b(f"{campaign}:{i}".encode(), digest_size=8).digest(), "little")
+
+@dataclass
+class CampaignStore:
+    """Local SQLite store for the results of equality check campaigns.
+
+    Use it as a context manager, or call close() when done, to make sure all buffered rows are written.
+
+    :Important methods:
+    - record(self, campaign, seed, params, ba, canonical_hash, measurement)
+        - Buffers the result of one check, writing the buffer to the database once it is full
+    - skip(self, campaign, seed)
+        - Marks a seed as done without a result, e.g. because its BA has already been checked
+    - flush(self)
+        - Writes all buffered results and the progress in one transaction
+    - last_seed(self, campaign)
+        - Returns the highest committed seed of a campaign, to resume from
+    - is_checked(self, ba, canonical_hash)
+        - Checks if a BA isomorphic to the given one has already been checked, in any campaign
+    - failure_rate_by_state_count(self, campaign=None)
+        - Aggregates the results per number of states
+    """
+    filename: str = CAMPAIGN_DB_FILENAME
+    batch_size: int = BATCH_SIZE
+    cache_size: int = CANDIDATE_CACHE_SIZE
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _buffer: List[Tuple] = field(default_factory=list, init=False, repr=False)
+    _progress: Dict[str, int] = field(default_factory=dict, init=False, repr=False) # campaign -> last buffered seed
+    _pending: Dict[str, List[BuchiAutomaton]] = field(default_factory=dict, init=False, repr=False) # canonical hash -> buffered BAs
+    _candidates: Dict[str, List[BuchiAutomaton]] = field(default_factory=OrderedDict, init=False, repr=False) # canonical hash -> checked BAs, least recently used first
+
+    def __post_init__(self):
+        self._connection = sqlite3.connect(self.filename)
+        # Write-ahead logging makes the batched commits cheap, while keeping committed rows safe
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def record(self, campaign: str, seed: int, params: Dict, ba: BuchiAutomaton, canonical_hash: str, measurement: Dict) -> None:
+        """
+        Buffers the result of checking one BA. The buffer is written once it holds batch_size rows.
+
+        Args:
+            campaign (str): Name of the campaign
+            seed (int): The seed from which the BA was generated
+            params (Dict): The parameters passed to the generator
+            ba (BuchiAutomaton): The checked BA
+            canonical_hash (str): The canonical hash of the BA
+            measurement (Dict): The result of the check ("result"), and the sizes and timings listed in MEASUREMENT_COLUMNS
+
+        Returns:
+            None
+        """
+        result = bool(measurement["result"])
+        # The snapshot leaves out the indexes that e.g. signature() builds on the BA
+        snapshot = ba.freeze()
+        self._buffer.append((
+            campaign,
+            seed,
+            json.dumps(params, sort_keys=True),
+            canonical_hash,
+            len(ba.states),
+            sum(len(to_states) for to_states in ba.transitions.values()),
+            int(result),
+            *[measurement.get(column) for column in MEASUREMENT_COLUMNS],
+            time.time(),
+            pickle.dumps(snapshot),
+        ))
+        checked = snapshot.thaw()
+        self._pending.setdefault(canonical_hash, []).append(checked)
+        if canonical_hash in self._candidates:
+            self._candidates[canonical_hash].append(checked)
+        self.skip(campaign, seed)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def skip(self, campaign: str, seed: int) -> None:
+        """
+        Marks a seed of a campaign as done, so that a resumed campaign continues after it. \
+        This is also done by record(), so it only needs to be called for seeds without a result.
+
+        Args:
+            campaign (str): Name of the campaign
+            seed (int): The seed
+
+        Returns:
+            None
+        """
+        self._progress[campaign] = max(seed, self._progress.get(campaign, seed))
+
+    def flush(self) -> None:
+        """Writes all buffered results and the progress of the campaigns to the database, in a single transaction."""
+        if not self._buffer and not self._progress:
+            return
+        with self._connection:
+            if self._buffer:
+                placeholders = ", ".join("?" * len(self._buffer[0]))
+                self._connection.executemany(f"INSERT OR REPLACE INTO checks VALUES ({placeholders})", self._buffer)
+            self._connection.executemany(
+                "INSERT INTO progress VALUES (?, ?) ON CONFLICT (campaign) DO UPDATE SET last_seed = MAX(last_seed, excluded.last_seed)",
+                self._progress.items())
+        self._buffer.clear()
+        self._progress.clear()
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Writes all buffered results and closes the database."""
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "CampaignStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def last_seed(self, campaign: str) -> int | None:
+        """
+        Returns the highest seed of a campaign that has been committed to the database, checked or skipped.
+
+        Args:
+            campaign (str): Name of the campaign
+
+        Returns:
+            (int | None): The highest committed seed, or None if nothing of the campaign has been committed
+        """
+        row = self._connection.execute("SELECT last_seed FROM progress WHERE campaign = ?", (campaign,)).fetchone()
+        return None if row is None else row[0]
+
+    def is_checked(self, ba: BuchiAutomaton, canonical_hash: str) -> bool:
+        """
+        Checks if a BA isomorphic to the given one has already been checked (or buffered), in any campaign.
+
+        Equal canonical hashes do not guarantee isomorphism, so the BA is compared with BuchiAutomaton.equals() \
+        to the checked BAs with the same hash. These are looked up in the database per hash, \
+        and kept in memory for the cache_size most recently looked up hashes.
+
+        Args:
+            ba (BuchiAutomaton): The BA
+            canonical_hash (str): The canonical hash of the BA
+
+        Returns:
+            bool: True if an isomorphic BA has been checked, False if not
+        """
+        return any(ba.equals(checked) for checked in self._checked_bas(canonical_hash))
+
+    def _checked_bas(self, canonical_hash: str) -> List[BuchiAutomaton]:
+        """Returns the committed and buffered BAs with the given canonical hash, from the cache or else from the database."""
+        if canonical_hash in self._candidates:
+            self._candidates.move_to_end(canonical_hash)
+            return self._candidates[canonical_hash]
+        rows = self._connection.execute(
+            "SELECT automaton FROM checks WHERE canonical_hash = ? AND automaton IS NOT NULL", (canonical_hash,))
+        checked = [pickle.loads(automaton).thaw() for automaton, in rows] + self._pending.get(canonical_hash, [])
+        self._candidates[canonical_hash] = checked
+        if len(self._candidates) > self.cache_size:
+            self._candidates.popitem(last=False)
+        return checked
+
+    def failures(self, campaign: str) -> List[Tuple[int, BuchiAutomaton]]:
+        """
+        Returns the committed BAs of a campaign that failed the check.
+
+        Args:
+            campaign (str): Name of the campaign
+
+        Returns:
+            List[Tuple[int, BuchiAutomaton]]: The seed and the BA of every failure, ordered by seed
+        """
+        rows = self._connection.execute(
+            "SELECT seed, automaton FROM checks WHERE campaign = ? AND result = 0 ORDER BY seed", (campaign,))
+        return [(seed, pickle.loads(automaton).thaw()) for seed, automaton in rows]
+
+    def failure_rate_by_state_count(self, campaign: str | None = None) -> List[Tuple[int, int, int, float]]:
+        """
+        Aggregates the committed results per number of states.
+
+        Args:
+            campaign (str | None=None): Name of the campaign to aggregate, or None to aggregate over all campaigns
+
+        Returns:
+            List[Tuple[int, int, int, float]]: Rows of (number of states, number of checks, number of failures, failure rate)
+        """
+        query = "SELECT n_states, COUNT(*), SUM(1 - result), AVG(1.0 - result) FROM checks"
+        args = ()
+        if campaign is not None:
+            query += " WHERE campaign = ?"
+            args = (campaign,)
+        query += " GROUP BY n_states ORDER BY n_states"
+        return self._connection.execute(query, args).fetchall()
+
+    def campaigns(self) -> List[Tuple[str, int, int]]:
+        """Returns rows of (campaign name, number of committed checks, highest committed seed)."""
+        return self._connection.execute(
+            "SELECT progress.campaign, COUNT(checks.seed), progress.last_seed FROM progress "
+            "LEFT JOIN checks ON checks.campaign = progress.campaign "
+            "GROUP BY progress.campaign ORDER BY progress.campaign").fetchall()
+
+if __name__ == "__main__":
+    import sys
+
+    filename = sys.argv[1] if len(sys.argv) > 1 else CAMPAIGN_DB_FILENAME
+    with CampaignStore(filename) as store:
+        for campaign, n_checks, last_seed in store.campaigns():
+            print(f"Campaign '{campaign}': {n_checks} checks, last seed {last_seed}")
+            for n_states, n, n_failures, rate in store.failure_rate_by_state_count(campaign):
+                print(f"\t{n_states} states:\t{n_failures}/{n} failed ({rate:.2%})")
@@ -0,0 +1,388 @@
+"""Script for comparing complementation constructions for Büchi automata.
+
+ba.py only contains the upper part of Allred & Ultes-Nitsche's complementation construction. This file adds complete
+complementation constructions to compare it against, as engines behind a common interface (see Engine and ENGINES):
+- "rank": the rank-based construction of Kupferman & Vardi, restricted to tight rankings (Friedgut, Kupferman & Vardi). \
+    A first, subset-construction phase guesses when to switch to tight level rankings, which are checked by a breakpoint.
+- "slice": a slice-based construction. Its first phase is the upper part of ba.py. In the second phase, every set of a slice \
+    is coloured, to check with a breakpoint that the accepting sets created after the switch all die out.
+- "upper part": the upper part of ba.py itself, which is only the first step of a complementation construction. \
+    It is included as the reference the others are measured against.
+
+All engines share one macrostate representation: a tuple of (set of states, label) pairs, from left to right (see Macrostate). \
+The state ids of the constructed automata are rendered from it by macrostate_id(), in the same format as the \
+upper part of ba.py, e.g. "{A,B},{C}" for unlabelled sets, and "{A,B}1,{C}2*" for labelled ones.
+
+Running this file checks the complements against the original BAs on ultimately periodic words, \
+and then benchmarks all engines on the saved BAs and on generated ones.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+from ba import BuchiAutomaton
+import networkx as nx
+import time
+
+# Sets of states with a label (e.g. a rank or a colour), from left to right
+Macrostate = Tuple[Tuple[FrozenSet[str], str], ...]
+
+# State id of the macrostate without any sets
+EMPTY_MACROSTATE = "{}"
+# Maximum number of states an engine constructs in the benchmark, before it gives up on an input
+MAX_STATES = 20_000
+
+# Colours of the sets in the second phase of the slice-based construction
+_UNMARKED = "0" # No accepting set has been created in this set's history since the switch
+_PENDING = "1"  # Descends from an accepting set, and is checked at the next breakpoint
+_CHECKED = "2"  # Descends from an accepting set, and must die out before the next breakpoint
+
+def macrostate_id(macrostate: Macrostate) -> str:
+    """Renders a macrostate as a state id, e.g. "{A,B}1,{C}2*". Without labels, this is the format of the upper part of ba.py."""
+    if not macrostate:
+        return EMPTY_MACROSTATE
+    return ",".join("{" + ",".join(sorted(states)) + "}" + label for states, label in macrostate)
+
+def _post(ba: BuchiAutomaton, states: FrozenSet[str], a: str) -> FrozenSet[str]:
+    """Returns the states reachable from the given states by reading a."""
+    return frozenset(target for q in states for target in ba.transitions.get((q, a), ()))
+
+def _explore(ba: BuchiAutomaton,
+             initial: Macrostate,
+             successors: Callable[[Macrostate, str], List[Macrostate]],
+             is_accepting: Callable[[Macrostate], bool],
+             max_states: Optional[int]) -> Optional[BuchiAutomaton]:
+    """
+    Constructs the automaton of all macrostates reachable from the initial one.
+
+    Args:
+        ba (BuchiAutomaton): The BA that is complemented
+        initial (Macrostate): The initial macrostate
+        successors (Callable[[Macrostate, str], List[Macrostate]]): Returns the successors of a macrostate for a symbol
+        is_accepting (Callable[[Macrostate], bool]): Returns True if a macrostate is accepting
+        max_states (Optional[int]): The maximum number of states to construct, or None for no limit
+
+    Returns:
+        Optional[BuchiAutomaton]: The constructed automaton, or None if it has more than max_states states
+    """
+    ids = {initial: macrostate_id(initial)}
+    constructed = BuchiAutomaton(states={ids[initial]},
+                                 alphabet=set(ba.alphabet),
+                                 initial_state=ids[initial])
+    to_do = [initial]
+    while to_do:
+        macrostate = to_do.pop()
+        if is_accepting(macrostate):
+            constructed.accepting_states.add(ids[macrostate])
+        for a in sorted(ba.alphabet):
+            for successor in successors(macrostate, a):
+                if successor not in ids:
+                    if max_states is not None and len(ids) >= max_states:
+                        return None
+                    ids[successor] = macrostate_id(successor)
+                    to_do.append(successor)
+                constructed.add_transition(ids[macrostate], a, ids[successor])
+    return constructed
+
+def _tight_rankings(states: List[str], bounds: Dict[str, int], accepting_states: FrozenSet[str]) -> Iterator[Dict[str, int]]:
+    """
+    Enumerates the tight level rankings of a set of states: the maximum rank r is odd, every odd rank up to r is used, \
+    and accepting states have even ranks.
+
+    Args:
+        states (List[str]): The states to rank
+        bounds (Dict[str, int]): The maximum rank of each state
+        accepting_states (FrozenSet[str]): The accepting states of the BA
+
+    Returns:
+        Iterator[Dict[str, int]]: The rankings, as state -> rank
+    """
+    if not states:
+        yield {}
+        return
+    # Number of states from position i on that can take an odd rank
+    n_odd_capable = [0] * (len(states) + 1)
+    for i in reversed(range(len(states))):
+        n_odd_capable[i] = n_odd_capable[i + 1] + (states[i] not in accepting_states)
+
+    def assign(i: int, r: int, ranking: Dict[str, int], missing: FrozenSet[int]) -> Iterator[Dict[str, int]]:
+        if len(missing) > n_odd_capable[i]:
+            return
+        if i == len(states):
+            yield dict(ranking)
+            return
+        q = states[i]
+        for rank in range(min(bounds[q], r) + 1):
+            if rank % 2 and q in accepting_states:
+                continue
+            ranking[q] = rank
+            yield from assign(i + 1, r, ranking, missing - {rank})
+        del ranking[q]
+
+    # Every odd rank up to r needs its own state, so r < 2 * len(states)
+    for r in range(1, min(max(bounds.values()), 2 * len(states) - 1) + 1, 2):
+        yield from assign(0, r, {}, frozenset(range(1, r + 1, 2)))
+
+def complement_rank_based(ba: BuchiAutomaton, max_states: Optional[int] = None) -> Optional[BuchiAutomaton]:
+    """
+    Complements a BA with the rank-based construction, restricted to tight level rankings.
+
+    Macrostates of the first phase are a single unlabelled set (the subset construction). \
+    Macrostates of the second phase are the states grouped by rank, labelled with the rank, \
+    and with a "*" if the states still owe a visit to an odd rank before the next breakpoint.
+
+    Args:
+        ba (BuchiAutomaton): The BA to complement
+        max_states (Optional[int]=None): The maximum number of states to construct, or None for no limit
+
+    Returns:
+        Optional[BuchiAutomaton]: The complement, or None if it has more than max_states states
+    """
+    accepting_states = frozenset(ba.accepting_states)
+
+    def ranked(ranking: Dict[str, int], owing: FrozenSet[str]) -> Macrostate:
+        groups = {}
+        for q, rank in ranking.items():
+            groups.setdefault((rank, q in owing), set()).add(q)
+        return tuple((frozenset(states), str(rank) + ("*" if is_owing else "")) for (rank, is_owing), states in sorted(groups.items()))
+
+    def successors(macrostate: Macrostate, a: str) -> List[Macrostate]:
+        if not macrostate or macrostate[0][1]:
+            # Second phase: the ranks may only decrease along transitions
+            ranking = {q: int(label.rstrip("*")) for states, label in macrostate for q in states}
+            owing = frozenset(q for states, label in macrostate if label.endswith("*") for q in states)
+            bounds = {}
+            for q, rank in ranking.items():
+                for target in ba.transitions.get((q, a), ()):
+                    bounds[target] = min(bounds.get(target, rank), rank)
+            result = []
+            for new_ranking in _tight_rankings(sorted(bounds), bounds, accepting_states):
+                even = frozenset(q for q, rank in new_ranking.items() if rank % 2 == 0)
+                # At a breakpoint, all even states start owing a visit to an odd rank
+                new_owing = even if not owing else _post(ba, owing, a) & even
+                result.append(ranked(new_ranking, new_owing))
+            return result
+        # First phase: follow the subset construction, or switch to any tight ranking of the successor
+        subset = _post(ba, macrostate[0][0], a)
+        bounds = {q: 2 * len(subset) - 1 for q in subset}
+        result = [((subset, ""),)] if subset else []
+        for new_ranking in _tight_rankings(sorted(subset), bounds, accepting_states):
+            result.append(ranked(new_ranking, frozenset()))
+        return result
+
+    def is_accepting(macrostate: Macrostate) -> bool:
+        is_ranked = not macrostate or bool(macrostate[0][1])
+        return is_ranked and not any(label.endswith("*") for _, label in macrostate)
+
+    return _explore(ba, ((frozenset({ba.initial_state}), ""),), successors, is_accepting, max_states)
+
+def _split_children(ba: BuchiAutomaton, sets: List[FrozenSet[str]], a: str) -> List[Tuple[int, FrozenSet[str], bool]]:
+    """
+    Computes the children of the sets of a slice for a symbol, like BuchiAutomaton.upper_part_successor(): \
+    the right-most set claims its targets first, and the accepting targets of a set are placed to the right of its other targets.
+
+    Returns:
+        List[Tuple[int, FrozenSet[str], bool]]: The children from left to right, as (index of the parent set, set of states, whether the states are accepting)
+    """
+    children = []
+    included_target_states = set()
+    for i in reversed(range(len(sets))):
+        target_states = _post(ba, sets[i], a).difference(included_target_states)
+        included_target_states.update(target_states)
+        accepting_target_states = target_states.intersection(ba.accepting_states)
+        if accepting_target_states:
+            children.append((i, frozenset(accepting_target_states), True))
+        if target_states - accepting_target_states:
+            children.append((i, frozenset(target_states - accepting_target_states), False))
+    children.reverse()
+    return children
+
+def complement_slice_based(ba: BuchiAutomaton, max_states: Optional[int] = None) -> Optional[BuchiAutomaton]:
+    """
+    Complements a BA with a slice-based construction.
+
+    A word is accepted by the BA iff the tree of slices has a branch with infinitely many accepting sets. \
+    The first phase constructs the slices without labels, like upper_part(). At some point, the complement switches to the \
+    second phase, in which every set is coloured: sets descending from an accepting set created after the switch are \
+    _PENDING or _CHECKED, all others _UNMARKED. A breakpoint is reached when no set is _CHECKED; then the _PENDING sets \
+    become _CHECKED. So the second phase accepts iff every accepting set created after the switch has finitely many descendants.
+
+    Args:
+        ba (BuchiAutomaton): The BA to complement
+        max_states (Optional[int]=None): The maximum number of states to construct, or None for no limit
+
+    Returns:
+        Optional[BuchiAutomaton]: The complement, or None if it has more than max_states states
+    """
+    def successors(macrostate: Macrostate, a: str) -> List[Macrostate]:
+        sets = [states for states, _ in macrostate]
+        children = _split_children(ba, sets, a)
+        if not macrostate or macrostate[0][1]:
+            # Second phase: the pending sets become checked at a breakpoint
+            colours = [colour for _, colour in macrostate]
+            if _CHECKED not in colours:
+                colours = [_CHECKED if colour == _PENDING else colour for colour in colours]
+            new_colours = []
+            for parent, _, accepting in children:
+                if colours[parent] == _UNMARKED:
+                    new_colours.append(_PENDING if accepting else _UNMARKED)
+                else:
+                    new_colours.append(colours[parent])
+            return [tuple((states, colour) for (_, states, _), colour in zip(children, new_colours))]
+        # First phase: continue with the unlabelled slice, or switch to the second phase
+        result = [tuple((states, "") for _, states, _ in children)] if children else []
+        result.append(tuple((states, _UNMARKED) for _, states, _ in children))
+        return result
+
+    def is_accepting(macrostate: Macrostate) -> bool:
+        is_coloured = not macrostate or bool(macrostate[0][1])
+        return is_coloured and all(colour != _CHECKED for _, colour in macrostate)
+
+    return _explore(ba, ((frozenset({ba.initial_state}), ""),), successors, is_accepting, max_states)
+
+def upper_part_only(ba: BuchiAutomaton, max_states: Optional[int] = None) -> Optional[BuchiAutomaton]:
+    """Constructs the upper part of a BA with BuchiAutomaton.upper_part(). This is not a complement (see Engine)."""
+    upper_part = ba.upper_part()
+    if max_states is not None and len(upper_part.states) > max_states:
+        return None
+    return upper_part
+
+@dataclass(frozen=True)
+class Engine:
+    """A construction that is compared in the benchmark.
+
+    :Fields:
+    - name: str
+    - construct: Callable[[BuchiAutomaton, Optional[int]], Optional[BuchiAutomaton]]
+        - Constructs the automaton for a BA, or returns None if it has more than the given maximum number of states
+    - is_complement: bool
+        - True if the constructed automaton accepts the complement of the language of the BA
+    """
+    name: str
+    construct: Callable[[BuchiAutomaton, Optional[int]], Optional[BuchiAutomaton]]
+    is_complement: bool = True
+
+ENGINES: List[Engine] = [
+    Engine("rank", complement_rank_based),
+    Engine("slice", complement_slice_based),
+    Engine("upper part", upper_part_only, is_complement=False),
+]
+
+def accepts_lasso(ba: BuchiAutomaton, prefix: str, period: str) -> bool:
+    """
+    Checks if a BA accepts the ultimately periodic word prefix period period period ..., \
+    i.e. if a run on it visits an accepting state on a cycle.
+
+    Args:
+        ba (BuchiAutomaton): The BA
+        prefix (str): The finite prefix of the word, one character per symbol
+        period (str): The non-empty part of the word that is repeated forever, one character per symbol
+
+    Returns:
+        bool: True if the BA accepts the word, False if not
+    """
+    assert period, "The period of a word must not be empty"
+    word = prefix + period
+    # Vertex (q, i): the run is in state q before reading position i of the word
+    graph = nx.DiGraph()
+    start = (ba.initial_state, 0)
+    graph.add_node(start)
+    to_do = [start]
+    while to_do:
+        q, i = to_do.pop()
+        next_i = i + 1 if i + 1 < len(word) else len(prefix)
+        for target in ba.transitions.get((q, word[i]), ()):
+            if (target, next_i) not in graph:
+                to_do.append((target, next_i))
+            graph.add_edge((q, i), (target, next_i))
+    for component in nx.strongly_connected_components(graph):
+        q, i = next(iter(component))
+        is_cycle = len(component) > 1 or graph.has_edge((q, i), (q, i))
+        if is_cycle and any(state in ba.accepting_states for state, _ in component):
+            return True
+    return False
+
+def benchmark(bas: Dict[str, BuchiAutomaton], engines: List[Engine] = ENGINES, max_states: Optional[int] = MAX_STATES) -> List[Dict]:
+    """
+    Runs every engine on every BA, and measures the number of states of the result and the run time.
+
+    The BAs are renamed first (see BuchiAutomaton.rename_states()), since the constructions do not allow every state id.
+
+    Args:
+        bas (Dict[str, BuchiAutomaton]): The BAs, by name
+        engines (List[Engine]=ENGINES): The engines to compare
+        max_states (Optional[int]=MAX_STATES): The maximum number of states an engine may construct per BA, or None for no limit
+
+    Returns:
+        List[Dict]: One row per BA and engine, with "input", "engine", "n_states" (None if more than max_states), \
+            "max_states" and "time" (in seconds)
+    """
+    rows = []
+    for name, ba in bas.items():
+        renamed = ba.copy()
+        renamed.rename_states()
+        for engine in engines:
+            start = time.perf_counter()
+            result = engine.construct(renamed, max_states)
+            rows.append({
+                "input": name,
+                "engine": engine.name,
+                "n_states": len(result.states) if result is not None else None,
+                "max_states": max_states,
+                "time": time.perf_counter() - start,
+            })
+    return rows
+
+def print_benchmark(rows: List[Dict], engines: List[Engine] = ENGINES) -> None:
+    """Prints the results of benchmark() per input, followed by a summary per engine."""
+    by_input = {}
+    for row in rows:
+        by_input.setdefault(row["input"], {})[row["engine"]] = row
+    names = [engine.name for engine in engines]
+    print("\t".join(["input"] + names))
+    for input_name, results in by_input.items():
+        cells = []
+        for name in names:
+            row = results[name]
+            states = str(row["n_states"]) if row["n_states"] is not None else ">" + str(row["max_states"])
+            cells.append(f"{states} ({row['time']:.3f}s)")
+        print("\t".join([input_name] + cells))
+    print("-" * 20)
+    for name in names:
+        engine_rows = [row for row in rows if row["engine"] == name]
+        finished = [row for row in engine_rows if row["n_states"] is not None]
+        mean_states = sum(row["n_states"] for row in finished) / len(finished) if finished else float("nan")
+        total_time = sum(row["time"] for row in engine_rows)
+        print(f"{name}:\tmean {mean_states:.1f} states on {len(finished)}/{len(engine_rows)} finished inputs, {total_time:.2f}s in total")
+
+if __name__ == "__main__":
+    from ba_generator import generate_ba
+    from ba_saver import load_ba, BA_FOLDER_NAME
+    import itertools
+    import os
+
+    # Test: On ultimately periodic words, the complements accept exactly the words that the BA rejects
+    print("Complements accept exactly the rejected words...")
+    bas = [generate_ba(min_n_states=1, max_n_states=3, min_nondet_degree=0, max_n_acc_states=2) for _ in range(40)]
+    for ba in bas:
+        ba.rename_states()
+        symbols = sorted(ba.alphabet)
+        words = [(prefix, period)
+                 for prefix_length in range(3) for period_length in range(1, 4)
+                 for prefix in map("".join, itertools.product(symbols, repeat=prefix_length))
+                 for period in map("".join, itertools.product(symbols, repeat=period_length))]
+        for engine in ENGINES:
+            if engine.is_complement:
+                complement = engine.construct(ba, None)
+                assert complement.is_valid()
+                for prefix, period in words:
+                    assert accepts_lasso(complement, prefix, period) != accepts_lasso(ba, prefix, period), (engine.name, prefix, period)
+    # The first phase of the slice-based construction is the upper part
+    for ba in bas:
+        slices = {state for state in complement_slice_based(ba).states if state[-1] == "}" and state != EMPTY_MACROSTATE}
+        assert slices == ba.upper_part().states
+    print("Test passed!")
+
+    # Benchmark on the saved BAs and on generated ones
+    bas = {filename: load_ba(filename) for filename in sorted(os.listdir(BA_FOLDER_NAME))}
+    bas.update({f"generated_{i}": generate_ba() for i in range(20)})
+    print_benchmark(benchmark(bas))
@@ -13,8 +13,63 @@ or iteratively on multiple randomly generated BAs.
 from ba import BuchiAutomaton
 from ba_generator import generate_ba
 from ba_saver import load_ba, ask_n_save
+from ba_dedup import signature
+from campaign_store import CampaignStore, CAMPAIGN_DB_FILENAME, campaign_seed
+from dataclasses import dataclass
+from typing import Dict
 from tqdm import tqdm
-    
+import inspect
+import random
+import time
+
+@dataclass(frozen=True)
+class Constructions:
+    """The automata constructed by the equality check for a BA A, and the run time of each step in seconds.
+
+    :Fields:
+    - reduced: BuchiAutomaton (R, with the state ids given by the reduction)
+    - renamed: BuchiAutomaton (R, with renamed states, from which U(R) is constructed)
+    - upper_part: BuchiAutomaton (U(A))
+    - reduced_upper_part: BuchiAutomaton (U(R))
+    - reduce_time: float
+    - upper_part_time: float
+    - reduced_upper_part_time: float
+    """
+    reduced: BuchiAutomaton
+    renamed: BuchiAutomaton
+    upper_part: BuchiAutomaton
+    reduced_upper_part: BuchiAutomaton
+    reduce_time: float
+    upper_part_time: float
+    reduced_upper_part_time: float
+
+def construct(ba: BuchiAutomaton) -> Constructions:
+    """
+    Constructs R, U(A) and U(R) for a given Büchi automaton A, as compared by the equality check.
+
+    Args:
+        ba (BuchiAutomaton): The Büchi automaton A
+
+    Returns:
+        Constructions: The constructed automata and the run times of the constructions
+    """
+    start = time.perf_counter()
+    reduced_ba = ba.reduce_nondeterm()
+    reduced = time.perf_counter()
+    upper_part = ba.upper_part()
+    upper = time.perf_counter()
+    renamed_ba = reduced_ba.copy()
+    renamed_ba.rename_states()
+    reduced_upper_part = renamed_ba.upper_part()
+    reduced_upper = time.perf_counter()
+    return Constructions(reduced=reduced_ba,
+                         renamed=renamed_ba,
+                         upper_part=upper_part,
+                         reduced_upper_part=reduced_upper_part,
+                         reduce_time=reduced - start,
+                         upper_part_time=upper - reduced,
+                         reduced_upper_part_time=reduced_upper - upper)
+
 def run_equal_check(ba: BuchiAutomaton, verbose: bool = False) -> bool:
     """
     Runs the equality check, i.e. tests if U(A)=U(R) for a given Büchi automaton A.
@@ -31,36 +86,34 @@ def run_equal_check(ba: BuchiAutomaton, verbose: bool = False) -> bool:
         # Print the automaton's structure
         print(ba)
 
+    constructions = construct(ba)
+    upper_part = constructions.upper_part
+    red_up = constructions.reduced_upper_part
+
     # Print automaton reduced to nondeterminism degree 2
-    reduced_ba = ba.reduce_nondeterm()
     if verbose:
         print("-" * 5 + "REDUCED" + "-" * 5)
-        print(reduced_ba)
+        print(constructions.reduced)
 
     # Print upper part derived from ba
-    uppper_part = ba.upper_part()
     if verbose:
         print("-" * 5 + "UPPER PART" + "-" * 5)
-        print(uppper_part)
+        print(upper_part)
 
         # Visualize it
         ba.visualize(filename="original_ba")
-        reduced_ba.visualize(filename="reduced_ba")
-        uppper_part.visualize(filename="upper_part")
-    
-    reduced_ba.rename_states()
-    red_up = reduced_ba.upper_part()
-    if verbose:
-        reduced_ba.visualize(filename="renamed_ba")
+        constructions.reduced.visualize(filename="reduced_ba")
+        upper_part.visualize(filename="upper_part")
+        constructions.renamed.visualize(filename="renamed_ba")
         red_up.visualize(filename="upper_part_from_reduced_ba")
 
     if verbose:
         print("---CHECKING FOR EQUALITY----")
         print("upper_part and upper_part_from_reduced_ba are...")
-    if uppper_part.equals(red_up):
+    if upper_part.equals(red_up):
         if verbose:
             print("EQUAL")
-            uppper_part.print_mapping(red_up)
+            upper_part.print_mapping(red_up)
         return True
     else:
         if verbose:
@@ -88,6 +141,74 @@ def iterate_equal_check(it: int, plotting: bool=False) -> BuchiAutomaton | bool:
             return ba
     return True
 
+def measure_equal_check(ba: BuchiAutomaton) -> Dict:
+    """
+    Runs the equality check like run_equal_check(), but also measures the sizes and run times of the constructions.
+
+    Args:
+        ba (BuchiAutomaton): The Büchi automaton A
+
+    Returns:
+        Dict: The result of the equality check ("result"), the number of states of R, U(A) and U(R) \
+            ("reduced_size", "upper_part_size", "reduced_upper_part_size"), and the run time in seconds \
+            of each step ("reduce_time", "upper_part_time", "reduced_upper_part_time", "equals_time")
+    """
+    constructions = construct(ba)
+    start = time.perf_counter()
+    result = constructions.upper_part.equals(constructions.reduced_upper_part)
+    end = time.perf_counter()
+    return {
+        "result": result,
+        "reduced_size": len(constructions.reduced.states),
+        "upper_part_size": len(constructions.upper_part.states),
+        "reduced_upper_part_size": len(constructions.reduced_upper_part.states),
+        "reduce_time": constructions.reduce_time,
+        "upper_part_time": constructions.upper_part_time,
+        "reduced_upper_part_time": constructions.reduced_upper_part_time,
+        "equals_time": end - start,
+    }
+
+def run_campaign(it: int, campaign: str, store: CampaignStore, generator_params: Dict | None = None) -> int:
+    """
+    Runs the equality check on generated BAs, and records every result in the campaign store.
+
+    The BA of iteration i is generated from the seed campaign_seed(campaign, i), so a campaign can be resumed: \
+    it continues after the last seed committed to the store. \
+    BAs that are isomorphic to an already checked BA (in any campaign) are skipped.
+
+    Args:
+        it (int): Number of seeds to try in this run
+        campaign (str): Name of the campaign
+        store (CampaignStore): The store to record the results in
+        generator_params (Dict | None=None): Parameters passed on to generate_ba(). Missing parameters take their default values.
+
+    Returns:
+        int: The number of BAs that failed the equality check in this run
+    """
+    # Record the effective generator parameters, including the defaults
+    params = {name: parameter.default for name, parameter in inspect.signature(generate_ba).parameters.items()}
+    params.update(generator_params or {})
+
+    last_seed = store.last_seed(campaign)
+    first_seed = 0 if last_seed is None else last_seed + 1
+    n_failures = 0
+    try:
+        for seed in tqdm(range(first_seed, first_seed + it)):
+            random.seed(campaign_seed(campaign, seed))
+            ba = generate_ba(**params)
+            canonical_hash = signature(ba)
+            if store.is_checked(ba, canonical_hash):
+                store.skip(campaign, seed)
+                continue
+            measurement = measure_equal_check(ba)
+            if not measurement["result"]:
+                n_failures += 1
+            store.record(campaign, seed, params, ba, canonical_hash, measurement)
+    finally:
+        # Also keep the results of an interrupted run
+        store.flush()
+    return n_failures
+
 def run_equal_check_on_ba_file(filename: str) -> bool:
     """
     Runs the equality check, i.e. tests if U(A)=U(R) for a given Büchi automaton A.
@@ -105,7 +226,8 @@ if __name__ == "__main__":
     done = False
     while not done:
         version = input("Do you want to test a (s)pecific BA for equality, " \
-        "or do you want to run equality tests on a number of (g)enerated BAs?\t")
+        "or do you want to run equality tests on a number of (g)enerated BAs, " \
+        "or do you want to run or resume a recorded (c)ampaign?\t")
         if version == "s":
             filename = input("Please input the filename of your specific saved BA:\t")
             print(f"Result: {run_equal_check_on_ba_file(filename)}")
@@ -120,5 +242,14 @@ if __name__ == "__main__":
             else:
                 print(f"Result: {result}")
             done = True
+        elif version == "c":
+            campaign = input("Please input the name of the campaign:\t")
+            iterations = int(input("How many BAs should we generate and check for equality?\t"))
+            with CampaignStore(CAMPAIGN_DB_FILENAME) as store:
+                n_failures = run_campaign(iterations, campaign, store)
+                print(f"{n_failures} BAs failed the equality check. Failure rates so far:")
+                for n_states, n, n_failed, rate in store.failure_rate_by_state_count(campaign):
+                    print(f"\t{n_states} states:\t{n_failed}/{n} failed ({rate:.2%})")
+            done = True
         else:
-            print("Invalid input. Please type 's' or 'g'.")
+            print("Invalid input. Please type 's', 'g' or 'c'.")
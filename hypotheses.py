@@ -0,0 +1,142 @@
+"""Scripts to test several hypotheses against the same Büchi automata in one pass.
+
+Let A be a Büchi automaton, R the result of reducing the non-determinism of A, and U the upper part construction
+(see equality_check.py). Many related hypotheses are statements about the same constructions, e.g. U(A)=U(R),
+bounds on the size of U(R), property PI of R, or U(A)=U(R) up to bisimulation (on the minimized forms "min A", "min R").
+
+Each Hypothesis declares the artifacts (constructions) it needs, by name. The artifacts of a BA are computed lazily:
+each artifact is built at most once per BA and shared by all hypotheses, and artifacts that no hypothesis needs are never built.
+
+Running this file checks all HYPOTHESES on a number of generated BAs, and prints how often each of them failed.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+from ba import BuchiAutomaton
+from ba_generator import generate_ba
+from tqdm import tqdm
+
+def _renamed_reduction(artifacts: "Artifacts") -> BuchiAutomaton:
+    """Returns a renamed copy of R, so that its state ids are usable as input to upper_part()."""
+    renamed = artifacts["R"].copy()
+    renamed.rename_states()
+    return renamed
+
+# Artifact name -> function computing that artifact from the (lazily computed) other artifacts
+ARTIFACTS: Dict[str, Callable[["Artifacts"], BuchiAutomaton]] = {
+    "R": lambda artifacts: artifacts["A"].reduce_nondeterm(),
+    "renamed R": _renamed_reduction,
+    "U(A)": lambda artifacts: artifacts["A"].upper_part(),
+    "U(R)": lambda artifacts: artifacts["renamed R"].upper_part(),
+    "min A": lambda artifacts: artifacts["A"].minimize(),
+    "min R": lambda artifacts: artifacts["renamed R"].minimize(),
+    "U(min A)": lambda artifacts: artifacts["min A"].upper_part(),
+    "U(min R)": lambda artifacts: artifacts["min R"].upper_part(),
+}
+
+@dataclass
+class Artifacts:
+    """Lazily computed constructions of one BA A, shared by all hypotheses checked on it.
+
+    Artifacts are looked up by name, e.g. artifacts["U(R)"]. The name "A" refers to the BA itself, \
+    all other names are defined in ARTIFACTS.
+    """
+    ba: BuchiAutomaton
+    _cache: Dict[str, BuchiAutomaton] = field(default_factory=dict, init=False, repr=False)
+
+    def __getitem__(self, name: str) -> BuchiAutomaton:
+        if name == "A":
+            return self.ba
+        if name not in self._cache:
+            assert name in ARTIFACTS, f"Unknown artifact '{name}'"
+            self._cache[name] = ARTIFACTS[name](self)
+        return self._cache[name]
+
+    def computed(self) -> List[str]:
+        """Returns the names of the artifacts that have been computed so far."""
+        return list(self._cache)
+
+@dataclass
+class Hypothesis:
+    """A hypothesis about the constructions of a BA.
+
+    :Fields:
+    - name: str
+    - requires: Tuple[str, ...]
+        - Names of the artifacts that are passed, in this order, to check
+    - check: Callable[..., bool]
+        - Returns True if the hypothesis holds for the given artifacts
+    """
+    name: str
+    requires: Tuple[str, ...]
+    check: Callable[..., bool]
+
+    def holds_for(self, artifacts: Artifacts) -> bool:
+        """Checks the hypothesis against the artifacts of a BA, computing the required ones if needed."""
+        return self.check(*[artifacts[name] for name in self.requires])
+
+HYPOTHESES: List[Hypothesis] = [
+    Hypothesis("U(A)=U(R)", ("U(A)", "U(R)"), lambda up_a, up_r: up_a.equals(up_r)),
+    Hypothesis("|U(R)|<=|U(A)|", ("U(A)", "U(R)"), lambda up_a, up_r: len(up_r.states) <= len(up_a.states)),
+    Hypothesis("R has PI", ("R",), lambda reduced: reduced.has_property_pi()),
+    Hypothesis("U(min A)=U(min R)", ("U(min A)", "U(min R)"), lambda up_a, up_r: up_a.equals(up_r)),
+]
+
+def run_hypotheses(ba: BuchiAutomaton, hypotheses: List[Hypothesis] = HYPOTHESES) -> Dict[str, bool]:
+    """
+    Checks all given hypotheses for a given Büchi automaton A, computing each required construction only once.
+
+    Args:
+        ba (BuchiAutomaton): The Büchi automaton A
+        hypotheses (List[Hypothesis]=HYPOTHESES): The hypotheses to check
+
+    Returns:
+        Dict[str, bool]: The result per hypothesis name
+    """
+    artifacts = Artifacts(ba)
+    return {hypothesis.name: hypothesis.holds_for(artifacts) for hypothesis in hypotheses}
+
+def iterate_hypotheses(it: int, hypotheses: List[Hypothesis] = HYPOTHESES) -> Dict[str, List[BuchiAutomaton]]:
+    """
+    Generates a new BA per iteration, and checks all given hypotheses on it.
+
+    Args:
+        it (int): Number of iterations, i.e. number of BAs to check the hypotheses for
+        hypotheses (List[Hypothesis]=HYPOTHESES): The hypotheses to check
+
+    Returns:
+        Dict[str, List[BuchiAutomaton]]: The generated BAs that did not satisfy each hypothesis, per hypothesis name
+    """
+    counter_examples = {hypothesis.name: [] for hypothesis in hypotheses}
+    for _ in tqdm(range(it)):
+        ba = generate_ba()
+        for name, result in run_hypotheses(ba, hypotheses).items():
+            if not result:
+                counter_examples[name].append(ba)
+    return counter_examples
+
+if __name__ == "__main__":
+    # Test: Only the required artifacts are computed
+    print("Artifacts are computed lazily...")
+    artifacts = Artifacts(generate_ba())
+    assert HYPOTHESES[2].holds_for(artifacts)
+    assert artifacts.computed() == ["R"]
+    HYPOTHESES[0].holds_for(artifacts)
+    assert sorted(artifacts.computed()) == ["R", "U(A)", "U(R)", "renamed R"]
+    HYPOTHESES[3].holds_for(artifacts)
+    assert sorted(artifacts.computed()) == ["R", "U(A)", "U(R)", "U(min A)", "U(min R)", "min A", "min R", "renamed R"]
+    print("Test passed!")
+
+    # Test: The minimized forms are bisimulation quotients, which keep the accepting states apart
+    print("Minimized forms are proper quotients...")
+    for _ in range(20):
+        artifacts = Artifacts(generate_ba())
+        for name, original in (("min A", "A"), ("min R", "renamed R")):
+            assert len(artifacts[name].states) <= len(artifacts[original].states)
+            assert bool(artifacts[name].accepting_states) == bool(artifacts[original].accepting_states)
+    print("Test passed!")
+
+    iterations = int(input("How many BAs should we generate and check the hypotheses for?\t"))
+    counter_examples = iterate_hypotheses(iterations)
+    for name, failed in counter_examples.items():
+        print(f"{name}:\t{len(failed)}/{iterations} counter examples")
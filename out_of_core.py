@@ -0,0 +1,301 @@
+"""Script for constructing very large upper parts and reduced automata with bounded memory.
+
+BuchiAutomaton.upper_part() and BuchiAutomaton.reduce_nondeterm() keep every state they construct in memory,
+in their to_do and done sets, and in the resulting automaton. For large inputs, this runs out of memory.
+The constructions in this file keep everything on disk instead:
+- the set of visited states is a hash table of state digests in a memory-mapped file (DiskHashSet)
+- the states are explored level by level (breadth-first). The successors found on one level are written to disk
+  in sorted batches, which are merged and checked against the visited states to form the next level
+- the constructed transitions are streamed straight into the output file, instead of into a BuchiAutomaton
+
+So the size of a construction is limited by disk space rather than memory.
+An output file can be loaded into a BuchiAutomaton again with load_streamed_ba(), if it fits into memory.
+
+Output file format (one entry per line, fields separated by tabs):
+- initial <state>
+- symbol <symbol>
+- accepting <state>
+- transition <from_state> <symbol> <to_state>
+
+Running this file checks the out-of-core constructions against the in-memory ones.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Tuple
+from ba import BuchiAutomaton, split_macrostate
+import hashlib
+import heapq
+import mmap
+import os
+import tempfile
+
+# Maximum number of successors that are kept in memory, before they are sorted and written to disk
+BATCH_SIZE = 100_000
+# Initial number of slots of the visited table. It doubles whenever it is half full.
+INITIAL_CAPACITY = 1 << 16
+
+_SLOT_SIZE = 16 # Bytes per digest
+_EMPTY_SLOT = bytes(_SLOT_SIZE)
+
+@dataclass
+class DiskHashSet:
+    """Set of strings, stored as 16-byte digests in an open-addressing hash table in a memory-mapped file.
+
+    Only the digests are stored, so two different strings are (with negligible probability) mistaken for the same one.
+    """
+    path: str
+    capacity: int = INITIAL_CAPACITY # Must be a power of 2
+    size: int = field(default=0, init=False)
+    _file: object = field(init=False, repr=False)
+    _table: mmap.mmap = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._file, self._table = self._create(self.path, self.capacity)
+
+    @staticmethod
+    def _create(path: str, capacity: int) -> Tuple[object, mmap.mmap]:
+        """Creates a memory-mapped file of empty slots."""
+        f = open(path, "w+b")
+        f.truncate(capacity * _SLOT_SIZE)
+        return f, mmap.mmap(f.fileno(), 0)
+
+    def add(self, key: str) -> bool:
+        """
+        Adds a string to the set.
+
+        Args:
+            key (str): The string to add
+
+        Returns:
+            bool: True if the string was not in the set yet, False if it was
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=_SLOT_SIZE).digest()
+        if digest == _EMPTY_SLOT:
+            digest = b"\x01" + digest[1:]
+        if self._insert(digest):
+            self.size += 1
+            if 2 * self.size > self.capacity:
+                self._grow()
+            return True
+        return False
+
+    def _insert(self, digest: bytes) -> bool:
+        """Inserts a digest with linear probing. Returns False if it was already present."""
+        mask = self.capacity - 1
+        i = int.from_bytes(digest[:8], "little") & mask
+        while True:
+            offset = i * _SLOT_SIZE
+            slot = self._table[offset:offset + _SLOT_SIZE]
+            if slot == _EMPTY_SLOT:
+                self._table[offset:offset + _SLOT_SIZE] = digest
+                return True
+            if slot == digest:
+                return False
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        """Doubles the capacity of the table, and re-inserts all digests."""
+        old_file, old_table, old_capacity = self._file, self._table, self.capacity
+        self.capacity *= 2
+        self._file, self._table = self._create(self.path + ".new", self.capacity)
+        for i in range(old_capacity):
+            slot = old_table[i * _SLOT_SIZE:(i + 1) * _SLOT_SIZE]
+            if slot != _EMPTY_SLOT:
+                self._insert(slot)
+        old_table.close()
+        old_file.close()
+        os.replace(self.path + ".new", self.path)
+
+    def close(self) -> None:
+        self._table.close()
+        self._file.close()
+
+def _write_run(batch: List[Tuple[str, bool]], path: str) -> str:
+    """Writes a batch of (state, accepting) pairs to a file, sorted by state. Returns the path of the file."""
+    with open(path, "w") as f:
+        for state, accepting in sorted(set(batch)):
+            f.write(f"{state}\t{int(accepting)}\n")
+    return path
+
+def _read_run(path: str) -> Iterator[Tuple[str, bool]]:
+    with open(path) as f:
+        for line in f:
+            state, accepting = line.rstrip("\n").split("\t")
+            yield state, accepting == "1"
+
+def _explore(initial_state: str,
+             successors: Callable[[str], List[Tuple[str, str, bool]]],
+             alphabet: List[str],
+             output_path: str,
+             work_dir: str | None,
+             batch_size: int) -> Tuple[int, int]:
+    """
+    Explores all states reachable from the initial state breadth-first, keeping the visited states and the frontier on disk.
+
+    Args:
+        initial_state (str): The initial state
+        successors (Callable[[str], List[Tuple[str, str, bool]]]): Returns the (symbol, target state, whether the target is accepting) of all transitions from a state
+        alphabet (List[str]): The symbols of the constructed automaton
+        output_path (str): The file to stream the constructed automaton into
+        work_dir (str | None): The directory for temporary files, or None for the system default
+        batch_size (int): The maximum number of successors kept in memory
+
+    Returns:
+        Tuple[int, int]: The number of states and transitions of the constructed automaton
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp, open(output_path, "w") as out:
+        out.write(f"initial\t{initial_state}\n")
+        for symbol in sorted(alphabet):
+            out.write(f"symbol\t{symbol}\n")
+
+        visited = DiskHashSet(os.path.join(tmp, "visited"))
+        visited.add(initial_state)
+        initial_is_accepting = False
+        n_states, n_transitions = 1, 0
+        level_path = os.path.join(tmp, "level_0")
+        with open(level_path, "w") as level:
+            level.write(initial_state + "\n")
+
+        depth = 0
+        while os.path.getsize(level_path) > 0:
+            # Expand the current level, writing its successors to disk in sorted batches
+            runs = []
+            batch = []
+            with open(level_path) as level:
+                for line in level:
+                    state = line.rstrip("\n")
+                    for symbol, target, accepting in successors(state):
+                        out.write(f"transition\t{state}\t{symbol}\t{target}\n")
+                        n_transitions += 1
+                        batch.append((target, accepting))
+                        if len(batch) >= batch_size:
+                            runs.append(_write_run(batch, os.path.join(tmp, f"run_{len(runs)}")))
+                            batch = []
+            if batch:
+                runs.append(_write_run(batch, os.path.join(tmp, f"run_{len(runs)}")))
+
+            # Merge the batches, and keep the states that have not been visited yet as the next level
+            depth += 1
+            next_level_path = os.path.join(tmp, f"level_{depth}")
+            with open(next_level_path, "w") as next_level:
+                previous = None
+                for state, accepting in heapq.merge(*[_read_run(run) for run in runs]):
+                    if state == previous:
+                        continue
+                    previous = state
+                    if visited.add(state):
+                        next_level.write(state + "\n")
+                        n_states += 1
+                        if accepting:
+                            out.write(f"accepting\t{state}\n")
+                    elif accepting and state == initial_state and not initial_is_accepting:
+                        # The initial state is visited before it can be reached as an accepting target
+                        out.write(f"accepting\t{state}\n")
+                        initial_is_accepting = True
+            for run in runs:
+                os.remove(run)
+            os.remove(level_path)
+            level_path = next_level_path
+
+        visited.close()
+    return n_states, n_transitions
+
+def upper_part_out_of_core(ba: BuchiAutomaton, output_path: str, work_dir: str | None = None, batch_size: int = BATCH_SIZE) -> Tuple[int, int]:
+    """
+    Constructs the upper part of a BA like BuchiAutomaton.upper_part(), but streams it into a file (see load_streamed_ba()), \
+    keeping the visited macrostates and the frontier on disk.
+
+    Args:
+        ba (BuchiAutomaton): The BA
+        output_path (str): The file to write the upper part to
+        work_dir (str | None=None): The directory for temporary files, or None for the system default
+        batch_size (int=BATCH_SIZE): The maximum number of successors kept in memory
+
+    Returns:
+        Tuple[int, int]: The number of states and transitions of the upper part
+    """
+    alphabet = sorted(ba.alphabet)
+    def successors(macrostate: str) -> List[Tuple[str, str, bool]]:
+        state_sets = split_macrostate(macrostate)
+        result = []
+        for a in alphabet:
+            new_state = ba.upper_part_successor(state_sets, a)
+            if new_state:
+                result.append((a, new_state, False))
+        return result
+    return _explore("{" + ba.initial_state + "}", successors, alphabet, output_path, work_dir, batch_size)
+
+def reduce_nondeterm_out_of_core(ba: BuchiAutomaton, output_path: str, work_dir: str | None = None, batch_size: int = BATCH_SIZE) -> Tuple[int, int]:
+    """
+    Reduces the non-determinism of a BA like BuchiAutomaton.reduce_nondeterm(), but streams the result into a file \
+    (see load_streamed_ba()), keeping the visited states and the frontier on disk.
+
+    Args:
+        ba (BuchiAutomaton): The BA
+        output_path (str): The file to write the reduced BA to
+        work_dir (str | None=None): The directory for temporary files, or None for the system default
+        batch_size (int=BATCH_SIZE): The maximum number of successors kept in memory
+
+    Returns:
+        Tuple[int, int]: The number of states and transitions of the reduced BA
+    """
+    alphabet = sorted(ba.alphabet)
+    def successors(state: str) -> List[Tuple[str, str, bool]]:
+        repr_states = state.split(sep=",")
+        return [(symbol, new_state, accepting) for symbol in alphabet
+                for new_state, accepting in ba.reduce_nondeterm_successors(repr_states, symbol)]
+    return _explore(ba.initial_state, successors, alphabet, output_path, work_dir, batch_size)
+
+def load_streamed_ba(path: str) -> BuchiAutomaton:
+    """
+    Loads a BA that was written by one of the out-of-core constructions.
+
+    Args:
+        path (str): The file to load
+
+    Returns:
+        BuchiAutomaton: The loaded BA
+    """
+    ba = BuchiAutomaton()
+    with open(path) as f:
+        for line in f:
+            kind, *fields = line.rstrip("\n").split("\t")
+            if kind == "transition":
+                ba.add_transition(*fields)
+            elif kind == "accepting":
+                ba.accepting_states.add(fields[0])
+            elif kind == "symbol":
+                ba.alphabet.add(fields[0])
+            elif kind == "initial":
+                ba.initial_state = fields[0]
+                ba.states.add(fields[0])
+    return ba
+
+if __name__ == "__main__":
+    from ba_generator import generate_ba
+    from ba_saver import load_ba, BA_FOLDER_NAME
+    import time
+
+    # Test: The out-of-core constructions match the in-memory ones, also with tiny batches and a growing visited table
+    print("Out-of-core constructions match the in-memory ones...")
+    bas = [load_ba(filename) for filename in sorted(os.listdir(BA_FOLDER_NAME))]
+    bas += [generate_ba() for _ in range(50)]
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "output")
+        for ba in bas:
+            upper_part_out_of_core(ba, output_path, batch_size=3)
+            assert load_streamed_ba(output_path).freeze() == ba.upper_part().freeze()
+            reduce_nondeterm_out_of_core(ba, output_path, batch_size=3)
+            assert load_streamed_ba(output_path).freeze() == ba.reduce_nondeterm().freeze()
+        visited = DiskHashSet(os.path.join(tmp, "visited"), capacity=4)
+        assert all(visited.add(str(i)) for i in range(1000))
+        assert not any(visited.add(str(i)) for i in range(1000))
+        visited.close()
+    print("Test passed!")
+
+    # Construct a large upper part
+    ba = generate_ba(min_n_states=20, max_n_states=20, max_n_acc_states=6)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        n_states, n_transitions = upper_part_out_of_core(ba, os.path.join(tmp, "upper_part"))
+        print(f"Upper part with {n_states} states and {n_transitions} transitions constructed in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,123 @@
+"""Script for constructing the upper part of a Büchi automaton on several cores.
+
+BuchiAutomaton.upper_part() expands one macrostate at a time. upper_part_parallel() instead explores the upper part
+breadth-first, one level at a time: the macrostates of a level are split into chunks, and a pool of worker processes
+computes the successors of each chunk for every symbol. The workers only return the transitions they found, and the new
+macrostates of the next level are the successors of these transitions that have not been visited yet.
+
+The frontier is sorted on every level and the results are merged in frontier order, so the constructed upper part
+is the same no matter how many workers are used. With a single worker, upper_part() is used, since the levels would only add overhead.
+
+Running this file checks upper_part_parallel() against upper_part(), and compares their run times.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from ba import BuchiAutomaton, split_macrostate
+import os
+
+# Levels with fewer macrostates than this are expanded without the workers, since the overhead would not pay off
+MIN_PARALLEL_LEVEL_SIZE = 256
+# Number of chunks per worker that a level is split into, to balance the load
+CHUNKS_PER_WORKER = 4
+
+# The BA whose upper part is constructed, set in each worker process by _init_worker()
+_worker_ba: BuchiAutomaton | None = None
+
+def _init_worker(ba: BuchiAutomaton) -> None:
+    global _worker_ba
+    _worker_ba = ba
+
+def _expand(ba: BuchiAutomaton, chunk: List[str]) -> List[Tuple[str, str, str]]:
+    """
+    Computes the successors of a chunk of macrostates, for every symbol.
+
+    Args:
+        ba (BuchiAutomaton): The BA whose upper part is constructed
+        chunk (List[str]): The macrostates to expand
+
+    Returns:
+        List[Tuple[str, str, str]]: The transitions (macrostate, symbol, successor) in chunk order
+    """
+    alphabet = sorted(ba.alphabet)
+    transitions = []
+    for macrostate in chunk:
+        state_sets = split_macrostate(macrostate)
+        for a in alphabet:
+            successor = ba.upper_part_successor(state_sets, a)
+            if successor:
+                transitions.append((macrostate, a, successor))
+    return transitions
+
+def _expand_in_worker(chunk: List[str]) -> List[Tuple[str, str, str]]:
+    return _expand(_worker_ba, chunk)
+
+def upper_part_parallel(ba: BuchiAutomaton, n_workers: int | None = None) -> BuchiAutomaton:
+    """
+    Constructs the upper part of a BA like BuchiAutomaton.upper_part(), expanding each breadth-first level on several processes.
+
+    Args:
+        ba (BuchiAutomaton): The BA
+        n_workers (int | None=None): The number of worker processes, or None to use all cores. With 1 worker, upper_part() is used.
+
+    Returns:
+        BuchiAutomaton: The upper part
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        return ba.upper_part()
+    initial_state = "{" + ba.initial_state + "}"
+    upper_part = BuchiAutomaton(states={initial_state},
+                                alphabet=ba.alphabet,
+                                initial_state=initial_state)
+    visited = {initial_state}
+    frontier = [initial_state]
+
+    pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(ba,))
+    try:
+        while frontier:
+            if len(frontier) < MIN_PARALLEL_LEVEL_SIZE:
+                results = [_expand(ba, frontier)]
+            else:
+                chunk_size = -(-len(frontier) // (n_workers * CHUNKS_PER_WORKER))
+                chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+                results = list(pool.map(_expand_in_worker, chunks)) # Results come back in chunk order
+
+            next_frontier = []
+            for transitions in results:
+                for macrostate, a, successor in transitions:
+                    upper_part.add_transition(macrostate, a, successor)
+                    if successor not in visited:
+                        visited.add(successor)
+                        next_frontier.append(successor)
+            frontier = sorted(next_frontier)
+    finally:
+        pool.shutdown()
+    return upper_part
+
+if __name__ == "__main__":
+    from ba_generator import generate_ba
+    from ba_saver import load_ba, BA_FOLDER_NAME
+    import time
+
+    # Test: The parallel construction matches upper_part(), for any number of workers
+    print("Parallel upper part matches upper_part()...")
+    bas = [load_ba(filename) for filename in sorted(os.listdir(BA_FOLDER_NAME))]
+    bas += [generate_ba() for _ in range(20)]
+    for ba in bas:
+        expected = ba.upper_part().freeze()
+        assert upper_part_parallel(ba, n_workers=2).freeze() == expected
+    ba = generate_ba(min_n_states=18, max_n_states=18, max_n_acc_states=6)
+    expected = ba.upper_part()
+    for n_workers in (1, 2, 3):
+        assert upper_part_parallel(ba, n_workers=n_workers).freeze() == expected.freeze()
+    print("Test passed!")
+
+    # Compare run times on a larger input
+    ba = generate_ba(min_n_states=24, max_n_states=24, max_n_acc_states=8)
+    start = time.perf_counter()
+    sequential = ba.upper_part()
+    print(f"upper_part():\t\t{time.perf_counter() - start:.1f}s ({len(sequential.states)} states)")
+    start = time.perf_counter()
+    parallel = upper_part_parallel(ba)
+    print(f"upper_part_parallel():\t{time.perf_counter() - start:.1f}s ({os.cpu_count()} workers)")